@@ -1,22 +1,51 @@
 """Asset resolution helpers (audio, video, image)."""
 import os
+import stat
+import functools
 from typing import Optional, List, Tuple
 
 AUDIO_EXTS = (".wav", ".mp3", ".ogg", ".flac", ".m4a")
 VIDEO_EXTS = (".mp4", ".mov", ".webm", ".mkv", ".avi")
 IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".gif")
 
+def _dir_mtime(folder: str) -> Optional[int]:
+    # a directory's mtime changes whenever entries are added, removed or renamed
+    try:
+        st = os.stat(folder)
+    except OSError:
+        return None
+    return st.st_mtime_ns if stat.S_ISDIR(st.st_mode) else None
+
+@functools.lru_cache(maxsize=64)
+def _entries(folder: str, exts: Tuple[str,...], mtime_ns: int) -> Tuple[Tuple[str, str], ...]:
+    """(lowercased stem, file name) for files in folder with one of exts, in directory order; one scandir per folder version."""
+    out = []
+    with os.scandir(folder) as it:
+        for entry in it:
+            nm, ext = os.path.splitext(entry.name.lower())
+            if ext in exts:
+                out.append((nm, entry.name))
+    return tuple(out)
+
+@functools.lru_cache(maxsize=4096)
+def _match(key: str, folder: str, exts: Tuple[str,...], mtime_ns: int) -> Optional[str]:
+    for nm, fname in _entries(folder, exts, mtime_ns):
+        # exact name, prefix or substring: all covered by the substring test
+        if key in nm:
+            return os.path.join(folder, fname)
+    return None
+
 def _find(base: str, folders: List[str], exts: Tuple[str,...]) -> Optional[str]:
     if not base:
         return None
     key = base.lower()
     for folder in folders:
-        if not os.path.isdir(folder):
+        mtime = _dir_mtime(folder)
+        if mtime is None:
             continue
-        for fname in os.listdir(folder):
-            nm, ext = os.path.splitext(fname.lower())
-            if ext in exts and (nm == key or nm.startswith(key) or key in nm):
-                return os.path.join(folder, fname)
+        hit = _match(key, folder, exts, mtime)
+        if hit:
+            return hit
     return None
 
 def find_audio_for_sample(sample_name: str, folders: List[str]) -> Optional[str]:
@@ -26,6 +55,7 @@ def find_video_for_sample(sample_name: str, folders: List[str]) -> Optional[str]
     return _find(sample_name, folders, VIDEO_EXTS)
 
 def list_assets(folder: str, exts=()):
-    if not os.path.isdir(folder):
+    mtime = _dir_mtime(folder)
+    if mtime is None:
         return []
-    return [os.path.join(folder, f) for f in os.listdir(folder) if os.path.splitext(f)[1].lower() in exts]
\ No newline at end of file
+    return [os.path.join(folder, fname) for _, fname in _entries(folder, tuple(exts), mtime)]
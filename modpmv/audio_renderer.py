@@ -14,7 +14,7 @@ from typing import List, Optional, Dict, Any
 import os
 import subprocess
 from .assets import find_audio_for_sample
-from .utils import ensure_dir
+from .utils import ensure_dir, ffmpeg_exe
 
 DEFAULT_ROW_MS = 250
 
@@ -28,6 +28,7 @@ def render_audio_from_module_data(module_data: Dict[str, Any],
     patterns = module_data.get("patterns", [])
     order = module_data.get("order", list(range(len(patterns))))
     channels = int(module_data.get("channels", 32))
+    resolved: Dict[str, Optional[str]] = {}  # sample name -> existing file or None, looked up and stat'ed once per render
     for idx in order:
         if idx < 0 or idx >= len(patterns):
             continue
@@ -37,11 +38,14 @@ def render_audio_from_module_data(module_data: Dict[str, Any],
             for tok in row[:channels]:
                 if isinstance(tok, str) and tok.upper().startswith("SAMPLE:"):
                     name = tok.split(":",1)[1]
-                    sdecl = module_data.get("samples",{}).get(name)
-                    file_path = sdecl.get("file") if sdecl else None
-                    if not file_path:
-                        file_path = find_audio_for_sample(name, audio_asset_folders)
-                    if file_path and os.path.exists(file_path):
+                    if name not in resolved:
+                        sdecl = module_data.get("samples",{}).get(name)
+                        file_path = sdecl.get("file") if sdecl else None
+                        if not file_path:
+                            file_path = find_audio_for_sample(name, audio_asset_folders)
+                        resolved[name] = file_path if file_path and os.path.exists(file_path) else None
+                    file_path = resolved[name]
+                    if file_path:
                         seg=_load_audio(file_path)
                         if len(seg) > row_duration_ms: seg = seg[:row_duration_ms]
                         elif len(seg) < row_duration_ms and len(seg)>0:
@@ -73,17 +77,6 @@ def apply_audio_plugins(audio: AudioSegment, plugins: List) -> AudioSegment:
             continue
     return seg
 
-def _ffmpeg_exe() -> Optional[str]:
-    import shutil
-    ff = shutil.which("ffmpeg")
-    if ff:
-        return ff
-    try:
-        import imageio_ffmpeg as iioff
-        return iioff.get_exe()
-    except Exception:
-        return None
-
 def export_audio_segment(seg: AudioSegment, out_path: str, bitrate: str = "192k"):
     """
     Robust export:
@@ -112,7 +105,7 @@ def export_audio_segment(seg: AudioSegment, out_path: str, bitrate: str = "192k"
         else:
             raise IOError(f"Failed to write WAV to {wav_path}")
     # Otherwise, transcode WAV -> requested format (prefer ffmpeg)
-    ff = _ffmpeg_exe()
+    ff = ffmpeg_exe()
     if ff and out_ext in ("mp3","m4a","aac","ogg","flac","wav","wavpcm"):
         # build ffmpeg command
         args = [ff, "-y", "-i", wav_path]
@@ -129,7 +122,7 @@ def export_audio_segment(seg: AudioSegment, out_path: str, bitrate: str = "192k"
             # generic copy/re-encode
             args += [out_path]
         try:
-            proc = subprocess.run(args, capture_output=True, text=True)
+            proc = subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             if proc.returncode != 0:
                 # ffmpeg failed; fall back to pydub export below
                 pass
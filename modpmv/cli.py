@@ -19,6 +19,10 @@ def main():
     p.add_argument("--audio-plugin", default=None)
     p.add_argument("--visual-plugin", default=None)
     p.add_argument("--mode", default="moviepy", choices=("moviepy","ffmpeg","stream"))
+    p.add_argument("--debug-overlay", action="store_true", help="draw per-channel tint bars on image-fallback channels")
+    p.add_argument("--quality", default="final", choices=("preview","final","archive"), help="x264 speed/size trade-off")
+    p.add_argument("--gpu", action=argparse.BooleanOptionalAction, default=True,
+                   help="encode with a hardware H.264 encoder (VideoToolbox/NVENC/QSV/AMF) when one works, else libx264")
     args = p.parse_args()
 
     module_data = parse(args.module)
@@ -38,7 +42,7 @@ def main():
         vcls = discover_plugins().get("visual", {}).get(args.visual_plugin)
         if vcls: vps.append(vcls())
     out_video = os.path.join(args.out, f"{module_data.get('title')}_video.mp4")
-    out_video, used, timeline = render_video_from_module_data(module_data, out_audio, [args.video_assets], [args.image_assets], out_video, mode=args.mode, visual_plugins=vps)
+    out_video, used, timeline = render_video_from_module_data(module_data, out_audio, [args.video_assets], [args.image_assets], out_video, mode=args.mode, visual_plugins=vps, hwaccel=args.gpu, audio_duration=len(audio) / 1000.0, debug_overlay=args.debug_overlay, quality=args.quality)
     print("Exporting package...")
     pkg = os.path.join(args.out, f"{module_data.get('title')}_ytpmv_pkg")
     ensure_dir(pkg)
@@ -73,6 +73,9 @@ def parse(path: str) -> Dict[str, Any]:
             data = fh.read()
         try:
             modwrap = load_module_from_bytes(data)
+        except ValueError:
+            # not a binary module (e.g. a text song saved as .mod) — nothing to diagnose
+            return _parse_text(path)
         except Exception as e:
             # write diagnostic and fallback to text parser
             try:
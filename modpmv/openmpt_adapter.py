@@ -14,210 +14,366 @@ The ModuleWrapper exposes:
 - num_patterns()
 - pattern_rows(idx)
 """
-from typing import Any, List, Tuple, Optional
-import traceback, io, os, tempfile
+from typing import Any, Dict, List, Tuple, Optional
+import contextlib, functools, importlib, importlib.util, traceback, io, os, sys, tempfile
 
 _BINDING_CANDIDATES = ("module_tracker", "moduletracker")
+# constructor names probed by _attempt_with_bytes, in order
+_TRACKER_CTORS = ("tracker", "analyzer", "track_glob")
+_GENERIC_CTORS = ("Module", "load", "load_module", "open", "open_module", "from_bytes")
+# getattr default marking a missing attribute (None can be a real value)
+_UNSET = object()
 
-_binding = None
-_binding_name = None
-for name in _BINDING_CANDIDATES:
+def _binding_available(name: str) -> bool:
+    # already imported elsewhere, or importable without executing it
+    if name in sys.modules:
+        return sys.modules[name] is not None
     try:
-        m = __import__(name)
-        _binding = m
-        _binding_name = name
-        break
-    except Exception:
-        _binding = None
-        _binding_name = None
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+def _find_binding_name() -> Optional[str]:
+    return next((n for n in _BINDING_CANDIDATES if _binding_available(n)), None)
+
+# presence is detected without importing; the extension itself is loaded by
+# _ensure_binding the first time a module is actually loaded or diagnosed
+_binding = None
+_binding_name = _find_binding_name()
+_binding_loaded = False
+_ctor_table: Tuple[Tuple[str, str, Any], ...] = ()
+
+def _ensure_binding():
+    global _binding, _binding_name, _binding_loaded, _ctor_table
+    if not _binding_loaded:
+        _binding_loaded = True
+        _binding, _binding_name = None, None
+        for name in _BINDING_CANDIDATES:
+            if not _binding_available(name):
+                continue
+            try:
+                _binding = importlib.import_module(name)
+                _binding_name = name
+                break
+            except Exception:
+                continue
+        if _binding is not None:
+            _ctor_table = _build_ctor_table(_binding)
+    return _binding
+
+# (offset, signature) of common tracker formats; a match skips the other checks
+_MODULE_MAGICS = (
+    (0, b"IMPM"), (0, b"Extended Module:"), (44, b"SCRM"), (0, b"MTM"), (0, b"MMD"),
+    (1080, b"M.K."), (1080, b"M!K!"), (1080, b"FLT4"), (1080, b"FLT8"), (1080, b"4CHN"),
+    (1080, b"6CHN"), (1080, b"8CHN"), (1080, b"CD81"), (1080, b"OKTA"), (1080, b"OCTA"),
+)
+# leading bytes of files that are certainly not modules
+_NOT_MODULE_MAGICS = (b"\x89PNG", b"\xff\xd8\xff", b"GIF8", b"%PDF", b"fLaC", b"ID3", b"OggS")
+_MIN_MODULE_SIZE = 64
+
+def _looks_like_module(data) -> bool:
+    """Cheap pre-check run before probing the binding. Formats without a magic
+    (e.g. 15-sample MODs) still pass; only short, text or known non-module data is rejected."""
+    if len(data) < _MIN_MODULE_SIZE:
+        return False
+    head = bytes(data[:1084])
+    if any(head[off:off + len(sig)] == sig for off, sig in _MODULE_MAGICS):
+        return True
+    if head.startswith(_NOT_MODULE_MAGICS) or head[4:8] == b"ftyp":
+        return False
+    # binary module headers always contain NUL padding; plain text never does
+    return b"\0" in head
+
+# binding name -> (constructor, arg kind) that produced a module; filled by
+# probing on first load, then called directly with no attribute lookup
+_loader_specs: Dict[str, Tuple[Any, str]] = {}
+
+# public attribute names per binding object; a loaded module's attrs don't change
+_attrs_cache: Dict[int, List[str]] = {}
 
 def _list_attrs(bind) -> List[str]:
-    try:
-        return sorted(a for a in dir(bind) if not a.startswith("_"))
-    except Exception:
-        return []
+    key = id(bind)
+    attrs = _attrs_cache.get(key)
+    if attrs is None:
+        # dir() already returns names in sorted order
+        try:
+            attrs = [a for a in dir(bind) if not a.startswith("_")]
+        except Exception:
+            return []
+        _attrs_cache[key] = attrs
+    return attrs
+
+def _format_attempts(attempts, verbose: bool = False) -> List[str]:
+    """Render the (desc, ok, exc) attempt log; only called when it is shown.
+    verbose adds the full traceback of each failed probe (run_diagnostics, or
+    load errors when MODPMV_DEBUG_BINDING is set)."""
+    lines = []
+    for desc, ok, exc in attempts:
+        lines.append(f"- {desc}: " + ("OK" if ok else f"{type(exc).__name__}: {exc}"))
+        if verbose and not ok:
+            tb = traceback.format_exception(type(exc), exc, exc.__traceback__)
+            lines.extend("    " + ln for ln in "".join(tb).rstrip().splitlines())
+    return lines
 
-def _safe_call(fn):
+def _write_all(fd: int, data: bytes):
+    # unbuffered: hand the caller's bytes straight to the kernel
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+@contextlib.contextmanager
+def _data_path(data: bytes):
+    """Yield a filesystem path whose contents are data, for path-only constructors.
+    On Linux the bytes live in an anonymous memfd exposed through /proc/self/fd,
+    so nothing is written to disk; elsewhere a mkstemp file is used and removed."""
+    if hasattr(os, "memfd_create") and os.path.isdir("/proc/self/fd"):
+        fd = os.memfd_create("modpmv.mod")
+        try:
+            _write_all(fd, data)
+            yield f"/proc/self/fd/{fd}"
+        finally:
+            os.close(fd)
+        return
+    fd, tmp = tempfile.mkstemp(suffix=".mod")
     try:
-        return (True, None, fn())
-    except Exception:
-        return (False, traceback.format_exc(), None)
+        try:
+            _write_all(fd, data)
+        finally:
+            os.close(fd)
+        yield tmp
+    finally:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
 
-def _attempt_with_bytes(bind, data: bytes):
-    attempts = []
-    raw = None
-    def rec(desc, ok, tb):
-        attempts.append((desc, "OK" if ok and tb is None else (tb.splitlines()[0] if tb else "OK(None)")))
-    # binding-specific heuristics
-    for name in ("tracker", "analyzer", "track_glob"):
-        if hasattr(bind, name) and callable(getattr(bind, name)):
-            # try bytes
-            ok, tb, val = _safe_call(lambda name=name: getattr(bind, name)(data))
-            rec(f"bind.{name}(data)", ok, tb)
-            if ok and val is not None:
-                return val, attempts
-            # try BytesIO
+# argument kinds probed per constructor, cheapest first; a memoryview lets
+# buffer-protocol bindings read the bytes without copying them
+_ARG_KINDS = ("memoryview", "data", "BytesIO", "tmpfile")
+
+def _memory_arg(kind: str, data: bytes):
+    if kind == "memoryview":
+        return memoryview(data)
+    if kind == "data":
+        return data
+    return io.BytesIO(data)
+
+def _call_loader(fn, kind: str, data: bytes):
+    """Re-run a constructor recorded by _attempt_with_bytes without probing."""
+    if kind != "tmpfile":
+        return fn(_memory_arg(kind, data))
+    with _data_path(data) as path:
+        return fn(path)
+
+# every (constructor name, argument kind) probe in order: all in-memory kinds
+# for every constructor (binding-specific heuristics first), and only then the
+# path kind, so a bytes-capable binding never gets a backing file created
+_PROBE_PLAN = tuple((n, k) for n in _TRACKER_CTORS + _GENERIC_CTORS for k in _ARG_KINDS if k != "tmpfile") \
+    + tuple((n, "tmpfile") for n in _TRACKER_CTORS + _GENERIC_CTORS)
+
+def _build_ctor_table(bind) -> Tuple[Tuple[str, str, Any], ...]:
+    """_PROBE_PLAN narrowed to the constructors bind actually has, as
+    (name, kind, callable); built once when the binding is imported."""
+    present = {}
+    for n in _TRACKER_CTORS + _GENERIC_CTORS:
+        fn = getattr(bind, n, _UNSET)
+        # tracker heuristics are only used when callable
+        if fn is not _UNSET and fn is not None and (callable(fn) or n not in _TRACKER_CTORS):
+            present[n] = fn
+    return tuple((name, kind, present[name]) for name, kind in _PROBE_PLAN if name in present)
+
+def _attempt_with_bytes(table, data: bytes):
+    attempts = []  # (desc, ok, exc) — formatted lazily by _format_attempts
+    with contextlib.ExitStack() as stack:
+        path = None
+        for name, kind, fn in table:
+            desc = f"bind.{name}({kind})"
             try:
-                b = io.BytesIO(data)
-                ok, tb, val = _safe_call(lambda name=name, b=b: getattr(bind, name)(b))
-                rec(f"bind.{name}(BytesIO)", ok, tb)
-                if ok and val is not None:
-                    return val, attempts
-            except Exception:
-                rec(f"bind.{name}(BytesIO)-exc", False, traceback.format_exc())
-            # try path
+                if kind != "tmpfile":
+                    arg = _memory_arg(kind, data)
+                else:
+                    # one backing file per call, shared by every path-based probe
+                    if path is None:
+                        path = stack.enter_context(_data_path(data))
+                    arg = path
+            except Exception as e:
+                attempts.append((desc + "-exc", False, e))
+                continue
             try:
-                fd, tmp = tempfile.mkstemp(suffix=".mod")
-                with os.fdopen(fd, "wb") as fh:
-                    fh.write(data)
-                ok, tb, val = _safe_call(lambda name=name, tmp=tmp: getattr(bind, name)(tmp))
-                rec(f"bind.{name}(tmpfile)", ok, tb)
-                if ok and val is not None:
-                    return val, attempts
-            except Exception:
-                rec(f"bind.{name}(tmpfile)-exc", False, traceback.format_exc())
-            finally:
-                try:
-                    if 'tmp' in locals() and os.path.exists(tmp):
-                        os.remove(tmp)
-                except Exception:
-                    pass
-    # generic attempts
-    for name in ("Module", "load", "load_module", "open", "open_module", "from_bytes"):
-        if hasattr(bind, name):
-            # try bytes
-            ok, tb, val = _safe_call(lambda name=name: getattr(bind, name)(data))
-            rec(f"bind.{name}(data)", ok, tb)
-            if ok and val is not None:
-                return val, attempts
-            # try BytesIO
+                val = fn(arg)
+            except Exception as e:
+                attempts.append((desc, False, e))
+                continue
+            attempts.append((desc, True, None))
+            if val is not None:
+                return val, attempts, (fn, kind)
+    return None, attempts, None
+
+# accessor candidates tried by ModuleWrapper._try, in order
+_TITLE_NAMES = ("title", "song_name", "get_title", "get_song_name", "name")
+_CHANNEL_NAMES = ("get_num_channels", "num_channels", "channels", "get_channels")
+_ORDER_NAMES = ("get_order_list", "order_list", "order", "get_order")
+_NUM_PATTERN_NAMES = ("get_num_patterns", "num_patterns", "patterns_count")
+# rows-like attributes of a pattern object from get_pattern() / .patterns[i]
+_PATTERN_ROW_NAMES = ("rows", "data", "pattern")
+_PATTERN_LIST_ROW_NAMES = ("rows", "data")
+_SAMPLE_ENTRY_NAMES = ("name", "sample_name")
+# (type of object, candidate names) -> first name that resolved on that type
+_resolved_names: Dict[Tuple[type, Tuple[str, ...]], str] = {}
+# placeholder names for unnamed samples (trackers allow at most a few hundred)
+_SAMPLE_NAMES = tuple(f"sample{i}" for i in range(1, 257))
+
+def _sample_name(i: int) -> str:
+    return _SAMPLE_NAMES[i - 1] if 0 < i <= len(_SAMPLE_NAMES) else f"sample{i}"
+
+@functools.lru_cache(maxsize=32)
+def _fallback_pattern(ch: int) -> Tuple[Tuple[str, ...], ...]:
+    """Four all-REST rows, shared per channel count; callers copy the rows."""
+    return tuple(("REST",) * ch for _ in range(4))
+
+def _entry_name(entry) -> Any:
+    # name attribute of a .samples entry, resolved per entry type
+    key = (type(entry), _SAMPLE_ENTRY_NAMES)
+    hit = _resolved_names.get(key)
+    if hit is None:
+        hit = next((n for n in _SAMPLE_ENTRY_NAMES if hasattr(entry, n)), "")
+        _resolved_names[key] = hit
+    return getattr(entry, hit, None) if hit else None
+
+def _rows_of(patt, names) -> Any:
+    """patt's first rows-like attribute as a list, or _UNSET if it has none.
+    The winning name is remembered per pattern type, so one getattr usually does."""
+    key = (type(patt), names)
+    hit = _resolved_names.get(key)
+    val = getattr(patt, hit, _UNSET) if hit is not None else _UNSET
+    if val is _UNSET:
+        for n in names:
+            val = getattr(patt, n, _UNSET)
+            if val is not _UNSET:
+                _resolved_names[key] = n
+                break
+        else:
+            return _UNSET
+    try:
+        return list(val)
+    except Exception:
+        return [list(r) for r in val]
+
+class ModuleWrapper:
+    """Uniform view over whatever module object the binding returns."""
+    # fixed attribute set; each accessor is resolved once and memoized
+    __slots__ = ("_raw", "_title", "_num_channels", "_sample_names", "_order", "_num_patterns",
+                 "_pattern_src")
+    def __init__(self, raw):
+        self._raw = raw
+        self._title = self._num_channels = self._sample_names = self._order = self._num_patterns = _UNSET
+        self._pattern_src = _UNSET
+    def _try(self, names):
+        raw = self._raw
+        key = (type(raw), names)
+        hit = _resolved_names.get(key)
+        if hit is not None:
+            # every module of this type answered to the same name so far
             try:
-                b = io.BytesIO(data)
-                ok, tb, val = _safe_call(lambda name=name, b=b: getattr(bind, name)(b))
-                rec(f"bind.{name}(BytesIO)", ok, tb)
-                if ok and val is not None:
-                    return val, attempts
+                v = getattr(raw, hit, _UNSET)
+                if v is not _UNSET:
+                    return v() if callable(v) else v
             except Exception:
-                rec(f"bind.{name}(BytesIO)-exc", False, traceback.format_exc())
-            # try tmpfile
+                pass
+        for n in names:
             try:
-                fd, tmp = tempfile.mkstemp(suffix=".mod")
-                with os.fdopen(fd, "wb") as fh:
-                    fh.write(data)
-                ok, tb, val = _safe_call(lambda name=name, tmp=tmp: getattr(bind, name)(tmp))
-                rec(f"bind.{name}(tmpfile)", ok, tb)
-                if ok and val is not None:
-                    return val, attempts
+                v = getattr(raw, n, _UNSET)
+                if v is not _UNSET:
+                    v = v() if callable(v) else v
+                    _resolved_names[key] = n
+                    return v
             except Exception:
-                rec(f"bind.{name}(tmpfile)-exc", False, traceback.format_exc())
-            finally:
-                try:
-                    if 'tmp' in locals() and os.path.exists(tmp):
-                        os.remove(tmp)
-                except Exception:
-                    pass
-    return None, attempts
-
-def _wrap_module(raw_mod) -> Any:
-    class ModuleWrapper:
-        def __init__(self, raw):
-            self._raw = raw
-        def _try(self, names):
-            for n in names:
-                try:
-                    if hasattr(self._raw, n):
-                        v = getattr(self._raw, n)
-                        return v() if callable(v) else v
-                except Exception:
-                    continue
-            return None
-        @property
-        def title(self) -> str:
-            v = self._try(("title", "song_name", "get_title", "get_song_name", "name"))
-            return str(v) if v is not None else ""
-        @property
-        def num_channels(self) -> int:
-            v = self._try(("get_num_channels", "num_channels", "channels", "get_channels"))
+                continue
+        return None
+    @property
+    def title(self) -> str:
+        if self._title is _UNSET:
+            v = self._try(_TITLE_NAMES)
+            self._title = str(v) if v is not None else ""
+        return self._title
+    @property
+    def num_channels(self) -> int:
+        if self._num_channels is _UNSET:
+            v = self._try(_CHANNEL_NAMES)
             try:
-                return int(v) if v is not None else 0
+                self._num_channels = int(v) if v is not None else 0
             except Exception:
-                return 0
-        def sample_names(self) -> List[str]:
-            names = []
+                self._num_channels = 0
+        return self._num_channels
+    def sample_names(self) -> List[str]:
+        if self._sample_names is _UNSET:
+            self._sample_names = self._read_sample_names()
+        return list(self._sample_names)
+    def _read_sample_names(self) -> List[str]:
+        # one read of .samples when the binding has it; per-index calls otherwise
+        get_name = getattr(self._raw, "get_sample_name", None)
+        def _by_index(i: int):
+            if not callable(get_name):
+                return None
             try:
-                if hasattr(self._raw, "get_num_samples") and callable(getattr(self._raw, "get_num_samples")):
-                    n = int(self._raw.get_num_samples())
-                    get_name = getattr(self._raw, "get_sample_name", None)
-                    for i in range(1, n+1):
-                        nm = None
-                        if callable(get_name):
-                            try:
-                                nm = get_name(i)
-                            except Exception:
-                                nm = None
-                        if not nm:
-                            try:
-                                s = getattr(self._raw, "samples", None)
-                                if s and i-1 < len(s):
-                                    nm = getattr(s[i-1], "name", None) or getattr(s[i-1], "sample_name", None)
-                            except Exception:
-                                nm = None
-                        names.append(str(nm) if nm else f"sample{i}")
-                    return names
+                return get_name(i)
             except Exception:
-                pass
+                return None
+        try:
+            s = getattr(self._raw, "samples", None)
+            if s:
+                # entries without a name still get the binding's per-index name before a placeholder
+                return [str(_entry_name(e) or _by_index(i) or _sample_name(i)) for i, e in enumerate(s, start=1)]
+        except Exception:
+            pass
+        get_num = getattr(self._raw, "get_num_samples", None)
+        if callable(get_num) and callable(get_name):
             try:
-                s = getattr(self._raw, "samples", None)
-                if s:
-                    for i, e in enumerate(s, start=1):
-                        nm = getattr(e, "name", None) or getattr(e, "sample_name", None)
-                        names.append(str(nm) if nm else f"sample{i}")
-                    return names
+                return [str(_by_index(i) or _sample_name(i)) for i in range(1, int(get_num()) + 1)]
             except Exception:
                 pass
-            return names
-        def order_list(self):
-            v = self._try(("get_order_list", "order_list", "order", "get_order"))
-            try:
-                return list(v) if v is not None else []
-            except Exception:
-                return []
-        def num_patterns(self):
-            v = self._try(("get_num_patterns", "num_patterns", "patterns_count"))
+        return []
+    def order_list(self):
+        if self._order is _UNSET:
+            v = self._try(_ORDER_NAMES)
             try:
-                return int(v) if v is not None else 0
+                self._order = list(v) if v is not None else []
             except Exception:
-                return 0
-        def pattern_rows(self, idx: int) -> List[List[Any]]:
+                self._order = []
+        return list(self._order)
+    def num_patterns(self):
+        if self._num_patterns is _UNSET:
+            v = self._try(_NUM_PATTERN_NAMES)
             try:
-                if hasattr(self._raw, "get_pattern"):
-                    patt = self._raw.get_pattern(idx)
-                    if patt:
-                        for a in ("rows", "data", "pattern"):
-                            if hasattr(patt, a):
-                                val = getattr(patt, a)
-                                try:
-                                    return list(val)
-                                except Exception:
-                                    return [list(r) for r in val]
-                pl = getattr(self._raw, "patterns", None)
-                if pl and idx < len(pl):
-                    p = pl[idx]
-                    for a in ("rows", "data"):
-                        if hasattr(p, a):
-                            val = getattr(p, a)
-                            try:
-                                return list(val)
-                            except Exception:
-                                return [list(r) for r in val]
+                self._num_patterns = int(v) if v is not None else 0
             except Exception:
-                pass
-            ch = max(1, self.num_channels)
-            return [["REST"] * ch for _ in range(4)]
+                self._num_patterns = 0
+        return self._num_patterns
+    def pattern_rows(self, idx: int) -> List[List[Any]]:
+        if self._pattern_src is _UNSET:
+            # look up the pattern accessors once; pattern_rows runs once per pattern
+            get_pattern = getattr(self._raw, "get_pattern", None)
+            self._pattern_src = (get_pattern if callable(get_pattern) else None,
+                                 getattr(self._raw, "patterns", None))
+        get_pattern, pl = self._pattern_src
+        try:
+            if get_pattern is not None:
+                patt = get_pattern(idx)
+                if patt:
+                    rows = _rows_of(patt, _PATTERN_ROW_NAMES)
+                    if rows is not _UNSET:
+                        return rows
+            if pl and idx < len(pl):
+                rows = _rows_of(pl[idx], _PATTERN_LIST_ROW_NAMES)
+                if rows is not _UNSET:
+                    return rows
+        except Exception:
+            pass
+        return [list(r) for r in _fallback_pattern(max(1, self.num_channels))]
+
+def _wrap_module(raw_mod) -> Any:
     return ModuleWrapper(raw_mod)
 
 def dump_binding_info() -> str:
-    if _binding is None:
+    if _ensure_binding() is None:
         return "No binding detected."
     try:
         attrs = _list_attrs(_binding)
@@ -226,46 +382,61 @@ def dump_binding_info() -> str:
         return f"Binding: {_binding_name}\nError listing attrs: {e}"
 
 def run_diagnostics(data: Optional[bytes] = None) -> str:
-    lines = []
-    if _binding is None:
-        lines.append("No binding detected (module_tracker).")
-        return "\n".join(lines)
-    lines.append(f"Detected binding: {_binding_name}")
+    buf = io.StringIO()
+    write = buf.write
+    def out(line: str):
+        write(line)
+        write("\n")
+    if _ensure_binding() is None:
+        return "No binding detected (module_tracker)."
+    out(f"Detected binding: {_binding_name}")
     try:
         attrs = _list_attrs(_binding)
-        lines.append("Top-level attrs (partial): " + ", ".join(attrs[:200]) + ("..." if len(attrs) > 200 else ""))
+        out("Top-level attrs (partial): " + ", ".join(attrs[:200]) + ("..." if len(attrs) > 200 else ""))
     except Exception as e:
-        lines.append(f"Error listing attributes: {e}")
+        out(f"Error listing attributes: {e}")
     if data is None:
-        lines.append("\nNo bytes provided to run constructor diagnostics.")
-        return "\n".join(lines)
-    raw, attempts = _attempt_with_bytes(_binding, data)
-    lines.append("\nConstructor attempts:")
-    for desc, res in attempts:
-        lines.append(f"- {desc}: {res}")
+        out("\nNo bytes provided to run constructor diagnostics.")
+        return buf.getvalue()[:-1]
+    raw, attempts, _ = _attempt_with_bytes(_ctor_table, data)
+    out("\nConstructor attempts:")
+    for line in _format_attempts(attempts, verbose=True):
+        out(line)
     if raw is None:
-        lines.append("\nResult: FAILED to construct module object.")
+        out("\nResult: FAILED to construct module object.")
     else:
-        lines.append("\nResult: SUCCESS — wrapping module")
+        out("\nResult: SUCCESS — wrapping module")
         try:
             wrapped = _wrap_module(raw)
-            lines.append(f"Wrapped title: {wrapped.title}")
-            lines.append(f"Wrapped num_channels: {wrapped.num_channels}")
+            out(f"Wrapped title: {wrapped.title}")
+            out(f"Wrapped num_channels: {wrapped.num_channels}")
         except Exception as e:
-            lines.append(f"Wrap failed: {e}")
-    return "\n".join(lines)
+            out(f"Wrap failed: {e}")
+    return buf.getvalue()[:-1]
 
 def load_module_from_bytes(data: bytes):
-    if _binding is None:
+    if _ensure_binding() is None:
         raise ImportError("No module-tracker binding installed.")
-    raw, attempts = _attempt_with_bytes(_binding, data)
+    if not _looks_like_module(data):
+        raise ValueError("not a module file")
+    raw = None
+    spec = _loader_specs.get(_binding_name)
+    if spec is not None:
+        # fast path: this binding's known constructor, no probing or bookkeeping
+        try:
+            raw = _call_loader(*spec, data)
+        except Exception:
+            raw = None
     if raw is None:
-        lines = ["Failed to construct module object. Attempts:"]
-        for d, r in attempts:
-            lines.append(f"- {d}: {r}")
-        lines.append("Binding info:")
-        lines.append(dump_binding_info())
-        raise RuntimeError("\n".join(lines))
+        raw, attempts, spec = _attempt_with_bytes(_ctor_table, data)
+        if spec is not None:
+            _loader_specs[_binding_name] = spec
+        if raw is None:
+            lines = ["Failed to construct module object. Attempts:"]
+            lines.extend(_format_attempts(attempts, verbose=bool(os.environ.get("MODPMV_DEBUG_BINDING"))))
+            lines.append("Binding info:")
+            lines.append(dump_binding_info())
+            raise RuntimeError("\n".join(lines))
     try:
         return _wrap_module(raw)
     except Exception as e:
@@ -3,8 +3,10 @@ Plugin base classes and helpers for ModPMV Deluxe.
 Plugins should define metadata: name, description, tags, version, license, deps(optional)
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Tuple, List
-from pydub import AudioSegment
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, List
+
+if TYPE_CHECKING:  # annotation only; keeps pydub out of plugin discovery
+    from pydub import AudioSegment
 
 class PluginMeta:
     name: str = "unnamed"
@@ -18,9 +20,9 @@ class AudioPlugin(ABC, PluginMeta):
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
     @abstractmethod
-    def process(self, audio: AudioSegment) -> AudioSegment:
+    def process(self, audio: "AudioSegment") -> "AudioSegment":
         raise NotImplementedError
-    def preview(self, audio: AudioSegment, preview_ms: int = 5000) -> AudioSegment:
+    def preview(self, audio: "AudioSegment", preview_ms: int = 5000) -> "AudioSegment":
         return self.process(audio)
 
 class AudioEffectPlugin(AudioPlugin):
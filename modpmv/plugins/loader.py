@@ -2,17 +2,36 @@
 Plugin discovery & manifest for ModPMV Deluxe. Supports:
 - setuptools entry points
 - local plugins/ folder (audio/, visual/) and examples/plugins
+  (each file is loaded by path; plugin folders are not added to sys.path, but a plugin can
+  import helper modules next to it with `from . import helper`)
 - Marketplace metadata (license, deps)
 """
-import os, sys, importlib.util
+import os, sys, hashlib, importlib.machinery, importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from importlib.metadata import entry_points
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from .base import AudioPlugin, VisualPlugin
 
+# installed distributions don't change under a running process: the full
+# entry_points() scan runs once and each group's plugins are loaded once
+# (until refresh_plugins() is called)
+_all_entry_points = None
+_entry_point_cache: Dict[str, Dict[str, Any]] = {}
+
+def _all_eps():
+    global _all_entry_points
+    if _all_entry_points is None:
+        _all_entry_points = entry_points()
+    return _all_entry_points
+
 def _from_entry_points(group: str) -> Dict[str, Any]:
+    hit = _entry_point_cache.get(group)
+    if hit is not None:
+        return dict(hit)
     found = {}
     try:
-        eps = entry_points()
+        eps = _all_eps()
         items = eps.select(group=group) if hasattr(eps, "select") else eps.get(group, [])
         for ep in items:
             try:
@@ -23,65 +42,197 @@ def _from_entry_points(group: str) -> Dict[str, Any]:
                 continue
     except Exception:
         pass
-    return found
+    _entry_point_cache[group] = found
+    return dict(found)
 
-def _from_folder(folder: str) -> Dict[str, Any]:
-    plugins = {}
-    if not os.path.isdir(folder):
-        return plugins
-    sys.path.insert(0, folder)
-    for fn in os.listdir(folder):
-        if not fn.endswith(".py") or fn.startswith("_"): continue
-        path=os.path.join(folder, fn)
-        modname=os.path.splitext(fn)[0]
-        try:
-            spec=importlib.util.spec_from_file_location(modname, path)
-            mod=importlib.util.module_from_spec(spec)
+# real path -> ((mtime_ns, size), plugins found in that file); a plugin file is only
+# executed again when it changes on disk
+_file_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+# sys.modules key -> (mtime_ns, size) of the file the registered module came from
+_loaded_sigs: Dict[str, Tuple[int, int]] = {}
+
+def _read_code(path: str, modname: str):
+    # read + compile (or load the cached .pyc) without executing; None on failure
+    try:
+        return importlib.machinery.SourceFileLoader(modname, path).get_code(modname)
+    except Exception:
+        return None
+
+def _plugin_key(path: str) -> str:
+    # dot-free sys.modules name for the plugin file at (real) path
+    return "modpmv_plugin_" + hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+
+def _load_plugin_module(path: str, sig: Tuple[int, int], code=None):
+    """Execute the plugin file at path, reusing the module registered in
+    sys.modules under _plugin_key(path) while the file is unchanged.
+    code is an already compiled code object for the file, if prefetched.
+    The module's search path is its own folder, so a plugin can import
+    helpers next to it with `from . import helper` without touching sys.path."""
+    key = _plugin_key(path)
+    mod = sys.modules.get(key)
+    if mod is not None and _loaded_sigs.get(key) == sig:
+        return mod
+    spec=importlib.util.spec_from_file_location(key, path, submodule_search_locations=[os.path.dirname(path)])
+    mod=importlib.util.module_from_spec(spec)
+    sys.modules[key] = mod
+    try:
+        if code is not None:
+            exec(code, mod.__dict__)
+        else:
             spec.loader.exec_module(mod)  # type: ignore
-            for attr in dir(mod):
-                obj=getattr(mod, attr)
+    except BaseException:
+        sys.modules.pop(key, None)
+        _loaded_sigs.pop(key, None)
+        raise
+    _loaded_sigs[key] = sig
+    return mod
+
+def _from_file(path: str, modname: str, code=None) -> Dict[str, Any]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    sig = (st.st_mtime_ns, st.st_size)
+    # canonical key: one entry per file however the folder was spelled
+    path = os.path.realpath(path)
+    hit = _file_cache.get(path)
+    if hit is not None and hit[0] == sig:
+        return hit[1]
+    plugins = {}
+    try:
+        mod = _load_plugin_module(path, sig, code)
+        # plain namespace walk: no sorted dir() list, no descriptor lookups
+        for attr, obj in list(vars(mod).items()):
+            try:
+                if isinstance(obj, type) and issubclass(obj, (AudioPlugin, VisualPlugin)) and obj not in (AudioPlugin, VisualPlugin):
+                    plugins[getattr(obj, "name", f"{modname}.{attr}")] = obj
+            except Exception:
+                continue
+    except Exception:
+        pass
+    _file_cache[path] = (sig, plugins)
+    return plugins
+
+def _from_folder(folder: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """One pass over folder; returns (audio, visual) plugins split by base class."""
+    audio, visual = {}, {}
+    # plugin files are loaded by path; the folder is not put on sys.path
+    try:
+        with os.scandir(folder) as it:
+            entries = [e for e in it if e.name.endswith(".py") and not e.name.startswith("_") and e.is_file()]
+    except OSError:
+        return audio, visual
+    # files not loaded before: read and compile them on a thread pool (I/O and
+    # .pyc loading overlap); executing them stays serial, in directory order
+    cold = [e for e in entries if os.path.realpath(e.path) not in _file_cache
+            and _plugin_key(os.path.realpath(e.path)) not in sys.modules]
+    codes = {}
+    if len(cold) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(cold))) as pool:
+            found = pool.map(lambda e: _read_code(e.path, os.path.splitext(e.name)[0]), cold)
+            codes = {e.path: code for e, code in zip(cold, found)}
+    for e in entries:
+        for key, cls in _from_file(e.path, os.path.splitext(e.name)[0], codes.get(e.path)).items():
+            (audio if issubclass(cls, AudioPlugin) else visual)[key] = cls
+    return audio, visual
+
+def _folder_signature(folder: str):
+    """(name, mtime_ns, size) of each plugin file in folder; None if it doesn't exist."""
+    sig = []
+    try:
+        # one directory read; DirEntry carries the name and caches its stat
+        with os.scandir(folder) as it:
+            for e in it:
+                if not e.name.endswith(".py") or e.name.startswith("_"):
+                    continue
                 try:
-                    if isinstance(obj, type) and issubclass(obj, (AudioPlugin, VisualPlugin)) and obj not in (AudioPlugin, VisualPlugin):
-                        plugins[getattr(obj, "name", f"{modname}.{attr}")] = obj
-                except Exception:
+                    st = e.stat()
+                except OSError:
                     continue
-        except Exception:
-            continue
-    try: sys.path.pop(0)
-    except Exception: pass
-    return plugins
+                sig.append((e.name, st.st_mtime_ns, st.st_size))
+    except OSError:
+        return None
+    sig.sort()
+    return tuple(sig)
+
+# abs plugin folder -> (signature of every scanned folder, discovered plugins)
+_discovery_cache: Dict[Optional[str], Tuple[Any, Dict[str, Dict[str, Any]]]] = {}
 
-def discover_plugins(plugin_folder: Optional[str] = "plugins") -> Dict[str, Dict[str, Any]]:
-    audio={}; visual={}
-    audio.update(_from_entry_points("modpmv.plugins.audio"))
-    visual.update(_from_entry_points("modpmv.plugins.visual"))
+def refresh_plugins():
+    """Forget cached entry points and discovery results so the next discovery
+    rescans everything; plugin modules are only re-executed if their file changed."""
+    global _all_entry_points
+    _all_entry_points = None
+    _entry_point_cache.clear()
+    _file_cache.clear()
+    _discovery_cache.clear()
+    _manifest_cache.clear()
+
+def _discover(plugin_folder: Optional[str]) -> Tuple[Any, Dict[str, Dict[str, Any]]]:
+    """(signature, plugins) for plugin_folder, rescanning only when a folder changed."""
+    folders = []
     if plugin_folder:
-        audio.update(_from_folder(os.path.join(plugin_folder,"audio")))
-        visual.update(_from_folder(os.path.join(plugin_folder,"visual")))
-        audio.update(_from_folder(plugin_folder))
-        visual.update(_from_folder(plugin_folder))
+        folders += [os.path.join(plugin_folder,"audio"), os.path.join(plugin_folder,"visual"), plugin_folder]
     # include shipped examples by default
-    audio.update(_from_folder(os.path.join("examples","plugins")))
-    visual.update(_from_folder(os.path.join("examples","plugins")))
-    return {"audio":audio,"visual":visual}
+    folders.append(os.path.join("examples","plugins"))
+    # scan each directory once (e.g. the GUI passes examples/plugins itself);
+    # keep the last occurrence so later folders still take precedence
+    seen = set(); unique = []
+    for f in reversed(folders):
+        real = os.path.realpath(f)
+        if real not in seen:
+            seen.add(real); unique.append(f)
+    folders = unique[::-1]
+    key = os.path.abspath(plugin_folder) if plugin_folder else None
+    sig = tuple((os.path.abspath(f), _folder_signature(f)) for f in folders)
+    hit = _discovery_cache.get(key)
+    if hit is None or hit[0] != sig:
+        audio={}; visual={}
+        audio.update(_from_entry_points("modpmv.plugins.audio"))
+        visual.update(_from_entry_points("modpmv.plugins.visual"))
+        for folder in folders:
+            a, v = _from_folder(folder)
+            audio.update(a)
+            visual.update(v)
+        hit = _discovery_cache[key] = (sig, {"audio":audio,"visual":visual})
+    return hit
+
+def discover_plugins(plugin_folder: Optional[str] = "plugins", refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+    if refresh:
+        refresh_plugins()
+    # fresh outer dicts so callers can't alter the cached result
+    return {ptype: dict(found) for ptype, found in _discover(plugin_folder)[1].items()}
+
+# abs plugin folder -> (discovery signature, manifest sorted by (type, name))
+_manifest_cache: Dict[Optional[str], Tuple[Any, List[Mapping[str, Any]]]] = {}
 
-def list_plugins_manifest(plugin_folder: Optional[str] = "plugins") -> List[Dict[str, Any]]:
-    discovered = discover_plugins(plugin_folder)
+def list_plugins_manifest(plugin_folder: Optional[str] = "plugins", refresh: bool = False) -> List[Mapping[str, Any]]:
+    if refresh:
+        refresh_plugins()
+    sig, discovered = _discover(plugin_folder)
+    key = os.path.abspath(plugin_folder) if plugin_folder else None
+    hit = _manifest_cache.get(key)
+    if hit is not None and hit[0] == sig:
+        return list(hit[1])
     manifest=[]
     for ptype in ("audio","visual"):
         for name, cls in discovered.get(ptype, {}).items():
             try:
-                manifest.append({
+                # read-only entries: the same objects are handed out on every call
+                manifest.append(MappingProxyType({
                     "name": getattr(cls, "name", name),
                     "type": ptype,
                     "description": getattr(cls, "description","") or "",
-                    "tags": getattr(cls, "tags", []) or [],
+                    "tags": tuple(getattr(cls, "tags", []) or []),
                     "version": getattr(cls, "version","0.0.1"),
                     "license": getattr(cls, "license",""),
-                    "deps": getattr(cls, "deps", []),
+                    "deps": tuple(getattr(cls, "deps", []) or []),
                     "class": cls
-                })
+                }))
             except Exception:
                 continue
+    # sorted once per discovery result rather than on every call
     manifest.sort(key=lambda m:(m["type"], m["name"]))
-    return manifest
\ No newline at end of file
+    _manifest_cache[key] = (sig, manifest)
+    return list(manifest)
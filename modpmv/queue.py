@@ -1,9 +1,9 @@
 """
 Simple job queue for ModPMV Deluxe — JSON file backed.
 """
-import os, json
+import os
 from typing import Dict, Any, List
-from .utils import ensure_dir
+from .utils import ensure_dir, read_json, write_json
 
 QUEUE_DIR = ".modpmv_jobs"
 def _ensure():
@@ -11,17 +11,15 @@ def _ensure():
 
 def push_job(job_id: str, job: Dict[str, Any]):
     _ensure()
-    path = os.path.join(QUEUE_DIR, f"{job_id}.json")
-    with open(path, "w", encoding="utf-8") as fh:
-        json.dump(job, fh, indent=2, ensure_ascii=False)
+    write_json(os.path.join(QUEUE_DIR, f"{job_id}.json"), job)
 
 def list_jobs() -> List[str]:
     _ensure()
-    return [f for f in os.listdir(QUEUE_DIR) if f.endswith(".json")]
+    with os.scandir(QUEUE_DIR) as it:
+        return [e.name for e in it if e.name.endswith(".json") and e.is_file(follow_symlinks=False)]
 
 def load_job(fn: str) -> Dict[str, Any]:
-    path = os.path.join(QUEUE_DIR, fn); 
-    with open(path, "r", encoding="utf-8") as fh: return json.load(fh)
+    return read_json(os.path.join(QUEUE_DIR, fn))
 
 def pop_job(fn: str):
     p = os.path.join(QUEUE_DIR, fn)
@@ -1,9 +1,30 @@
 """Utility helpers used across ModPMV V5."""
 import os
+import sys
 import json
+import shutil
 import hashlib
+import functools
+import tempfile
 import time
-from typing import Any
+from typing import Any, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows
+try:
+    import orjson  # optional: much faster JSON, writes UTF-8 bytes directly
+except Exception:
+    orjson = None
+try:
+    from blake3 import blake3  # optional: SIMD hashing for stable_hash
+except Exception:
+    blake3 = None
+try:
+    import xxhash  # optional: non-cryptographic, fastest fallback for stable_hash
+except Exception:
+    xxhash = None
 
 def ensure_dir(path: str):
     if not path:
@@ -11,16 +32,92 @@ def ensure_dir(path: str):
     os.makedirs(path, exist_ok=True)
 
 def read_json(path: str) -> Any:
+    if orjson is not None:
+        with open(path, "rb") as fh:
+            return orjson.loads(fh.read())
     with open(path, "r", encoding="utf-8") as fh:
         return json.load(fh)
 
 def write_json(path: str, data: Any):
-    ensure_dir(os.path.dirname(path) or ".")
-    with open(path, "w", encoding="utf-8") as fh:
-        json.dump(data, fh, indent=2, ensure_ascii=False)
+    payload = None
+    if orjson is not None:
+        try:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            payload = None  # something orjson can't encode; let json try
+    if payload is None:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    atomic_write_bytes(path, payload)
+
+# os.umask can only be read by setting it; done once at import, not per write
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+def atomic_write_bytes(path: str, payload: bytes):
+    """Write payload to path so readers only ever see the old or the new file:
+    temp file in the same directory, fsync, then os.replace."""
+    d = os.path.dirname(path) or "."
+    ensure_dir(d)
+    fd, tmp = tempfile.mkstemp(dir=d, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+        # mkstemp creates 0600; keep the existing file's mode, or what open() would give a new file
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except OSError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+_FICLONE = 0x40049409  # linux/fs.h: share src's extents with dst (copy-on-write)
+
+def fast_copy(src: str, dst: str):
+    """shutil.copy2, done as a reflink where the filesystem supports it (btrfs, XFS, ...)."""
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return  # opening dst for writing would truncate src
+    if fcntl is not None and sys.platform.startswith("linux"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass  # other filesystem or device: plain copy below
+    shutil.copy2(src, dst)
 
 def stable_hash(s: str) -> str:
+    # keys only name cache dirs, so any stable digest will do; the backend
+    # (and so the key length: 40 or 32 hex chars) depends on what is installed
+    if blake3 is not None:
+        return blake3(s.encode("utf-8")).hexdigest()[:40]
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(s.encode("utf-8"))
     return hashlib.sha1(s.encode("utf-8")).hexdigest()
 
+@functools.lru_cache(maxsize=1)
+def ffmpeg_exe() -> Optional[str]:
+    """ffmpeg from PATH, else the binary bundled with imageio-ffmpeg (looked up once per process)."""
+    ff = shutil.which("ffmpeg")
+    if ff:
+        return ff
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+@functools.lru_cache(maxsize=1)
+def ffprobe_exe() -> Optional[str]:
+    return shutil.which("ffprobe")
+
 def now_iso() -> str:
     return time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
\ No newline at end of file
@@ -8,121 +8,790 @@ This file includes:
 Fix: ensure render_preview is defined so GUI can import it without ImportError.
 """
 import os
+import sys
 import random
+import functools
+import itertools
+import importlib
 import subprocess
 import tempfile
 import shutil
-from typing import List, Optional, Tuple, Dict, Any
+import threading
+from queue import Queue, Full
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Optional, Tuple, Dict, Any, Iterator
 import numpy as np
-from moviepy.editor import (AudioFileClip, VideoFileClip, ImageClip, ColorClip,
-                            concatenate_videoclips, CompositeVideoClip)
 from .assets import find_video_for_sample, list_assets
 from .audio_renderer import render_audio_from_module_data, export_audio_segment
-from .utils import ensure_dir
+from .utils import ensure_dir, ffmpeg_exe, ffprobe_exe
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows
+try:
+    import cv2  # optional: fast RGB -> I420 conversion for the stream pipe
+except Exception:
+    cv2 = None
 
 DEFAULT_ROW_SECONDS = 0.25
 DEFAULT_SIZE = (1280, 720)
+ROWS_PER_FFMPEG = 8  # rows composited+concatenated per ffmpeg process in ffmpeg mode
+MAX_FFMPEG_JOBS = 6  # concurrent ffmpeg processes; each one already runs several encoder threads
+SAMPLE_FRAMES_BUDGET = 512 << 20  # bytes of decoded sample frames kept per stream render
+IMAGE_POOL_SIZE = 16  # distinct images rotated through per render; each is decoded+resized once
+
+@functools.lru_cache(maxsize=None)
+def _mp():
+    """moviepy.editor, imported on first render (it pulls in imageio, PIL, tqdm, ...)."""
+    return importlib.import_module("moviepy.editor")
+
+# libx264 (preset, crf) per render quality
+QUALITY_PRESETS = {
+    "preview": ("ultrafast", "28"),
+    "final": ("fast", "18"),
+    "archive": ("medium", "18"),
+}
+# the same qualities for hardware encoders: (NVENC preset, constant quality for NVENC/QSV/AMF,
+# VideoToolbox bitrate); "final" keeps the settings these encoders always used
+HW_QUALITY_PRESETS = {
+    "preview": ("p1", "30", "4M"),
+    "final": ("p4", "23", "8M"),
+    "archive": ("p6", "19", "16M"),
+}
 
-def _ffmpeg_exe() -> Optional[str]:
-    import shutil
-    ff = shutil.which("ffmpeg")
-    if ff:
-        return ff
+def _x264_args(quality: str = "final") -> List[str]:
+    preset, crf = QUALITY_PRESETS.get(quality, QUALITY_PRESETS["final"])
+    return ["-c:v", "libx264", "-preset", preset, "-crf", crf]
+
+@functools.lru_cache(maxsize=None)
+def _ffmpeg_encoders(ff: str) -> frozenset:
+    """Names of the video encoders this ffmpeg build offers (probed once per binary)."""
     try:
-        import imageio_ffmpeg as iioff
-        return iioff.get_exe()
-    except Exception:
+        out = subprocess.run([ff, "-hide_banner", "-encoders"], capture_output=True, text=True).stdout
+    except OSError:
+        return frozenset()
+    return frozenset(ln.split()[1] for ln in out.splitlines() if ln.strip()[:1] == "V" and len(ln.split()) > 1)
+
+@functools.lru_cache(maxsize=1024)
+def _probe_duration_cached(path: str, mtime_ns: int) -> Optional[float]:
+    ff = ffmpeg_exe()
+    probe = ffprobe_exe()
+    try:
+        if probe:
+            out = subprocess.run([probe, "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+                                 capture_output=True, text=True).stdout.strip()
+            return float(out) if out and out != "N/A" else None
+        if ff:
+            # no ffprobe next to imageio-ffmpeg: read the header line ffmpeg prints for -i
+            err = subprocess.run([ff, "-hide_banner", "-i", path], capture_output=True, text=True).stderr
+            for ln in err.splitlines():
+                ln = ln.strip()
+                if ln.startswith("Duration:"):
+                    hh, mm, ss = ln.split(",", 1)[0].split()[1].split(":")
+                    return int(hh) * 3600 + int(mm) * 60 + float(ss)
+    except (OSError, ValueError):
+        pass
+    return None
+
+def _probe_duration(path: str) -> Optional[float]:
+    """Container duration in seconds (None if unreadable), probed once per file version."""
+    try:
+        return _probe_duration_cached(path, os.stat(path).st_mtime_ns)
+    except OSError:
         return None
 
-def _image_clip_for_row(image_folders: List[str], duration: float, size: Tuple[int,int]):
-    images = []
-    for folder in image_folders:
-        images += list_assets(folder, exts=(".png", ".jpg", ".jpeg", ".bmp"))
-    if images:
-        chosen = random.choice(images)
-        return ImageClip(chosen).resize(newsize=size).set_duration(duration)
-    return ColorClip(size=size, color=(10,10,10)).set_duration(duration)
+@functools.lru_cache(maxsize=None)
+def _ffmpeg_filters(ff: str) -> frozenset:
+    """Names of the filters this ffmpeg build offers (probed once per binary)."""
+    try:
+        out = subprocess.run([ff, "-hide_banner", "-filters"], capture_output=True, text=True).stdout
+    except OSError:
+        return frozenset()
+    return frozenset(ln.split()[1] for ln in out.splitlines() if len(ln.split()) > 2 and "->" in ln)
+
+@functools.lru_cache(maxsize=None)
+def _hw_encoder_works(ff: str, codec: str) -> bool:
+    """
+    One-frame trial encode (once per binary and encoder). Builds often list NVENC/QSV/AMF
+    without the GPU or driver to run them, so being in -encoders alone isn't enough.
+    """
+    if codec not in _ffmpeg_encoders(ff):
+        return False
+    cmd = [ff, "-hide_banner", "-loglevel", "error", "-f", "lavfi", "-i", "color=s=256x256:d=0.1",
+           "-frames:v", "1", "-c:v", codec, "-f", "null", "-"]
+    try:
+        return subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL, timeout=15).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+def _hw_codec_args(ff: Optional[str], hwaccel: bool, quality: str = "final") -> Tuple[List[str], List[str]]:
+    """
+    (decode_args, encode_args) for the requested acceleration: VideoToolbox on macOS,
+    then NVENC, QSV, AMF. Falls back to libx264 when hwaccel is off or no hardware
+    encoder in this ffmpeg build passes a trial encode.
+    """
+    if not (hwaccel and ff):
+        return [], _x264_args(quality)
+    preset, q, rate = HW_QUALITY_PRESETS.get(quality, HW_QUALITY_PRESETS["final"])
+    if sys.platform == "darwin" and _hw_encoder_works(ff, "h264_videotoolbox"):
+        return ["-hwaccel", "videotoolbox"], ["-c:v", "h264_videotoolbox", "-b:v", rate]
+    if _hw_encoder_works(ff, "h264_nvenc"):
+        return ["-hwaccel", "cuda"], ["-c:v", "h264_nvenc", "-preset", preset, "-rc", "vbr", "-cq", q, "-b:v", "0"]
+    if _hw_encoder_works(ff, "h264_qsv"):
+        return [], ["-c:v", "h264_qsv", "-preset", "faster", "-global_quality", q]
+    if _hw_encoder_works(ff, "h264_amf"):
+        return [], ["-c:v", "h264_amf", "-quality", "speed", "-rc", "cqp", "-qp_i", q, "-qp_p", q]
+    return [], _x264_args(quality)
 
-def _write_moviepy(clips, audio, out_path: str, fps:int=24):
-    video = concatenate_videoclips(clips, method="compose")
+@functools.lru_cache(maxsize=64)
+def _resized_array_cached(path: str, size: Tuple[int,int], mtime_ns: int) -> np.ndarray:
+    from PIL import Image
+    with Image.open(path) as im:
+        alpha = im.mode in ("RGBA", "LA", "PA") or (im.mode == "P" and "transparency" in im.info)
+        im = im.convert("RGBA" if alpha else "RGB").resize(tuple(size), Image.LANCZOS)
+        arr = np.asarray(im, dtype=np.uint8)
+    arr.setflags(write=False)  # shared between clips
+    return arr
+
+def _resized_array(path: str, size: Tuple[int,int]) -> np.ndarray:
+    """Image decoded and resized to size once (per file version); RGBA keeps its alpha as the clip mask."""
+    return _resized_array_cached(path, tuple(size), os.stat(path).st_mtime_ns)
+
+def _image_clip(path: Optional[str], duration: float, size: Tuple[int,int], cache: Optional[Dict[str, Any]] = None):
+    mp = _mp()
+    if path:
+        clip = cache.get(path) if cache is not None else None
+        if clip is None:
+            clip = mp.ImageClip(_resized_array(path, size))
+            if cache is not None:
+                cache[path] = clip
+        return clip.set_duration(duration)
+    return mp.ColorClip(size=size, color=(10,10,10)).set_duration(duration)
+
+def _place(clip, pos: Tuple[int,int], opacity: float):
+    """
+    set_pos + set_opacity applied in place. Only for a clip the caller just created
+    (moviepy's setters would each return another copy); its mask is replaced, never mutated.
+    """
+    mp = _mp()
+    mask = clip.mask if clip.mask is not None else mp.ColorClip(clip.size, 1.0, ismask=True).set_duration(clip.duration)
+    clip.mask = mask.fl_image(lambda pic: opacity * pic)
+    clip.relative_pos = False
+    clip.pos = clip.mask.pos = lambda t: pos
+    return clip
+
+def _row_params(fps: int) -> List[str]:
+    """Output params shared by every row file so the concat demuxer can stream-copy them."""
+    return ["-pix_fmt", "yuv420p", "-profile:v", "high", "-r", str(fps), "-g", str(fps), "-video_track_timescale", "15360"]
+
+_SHM_MIN_FREE = 1 << 30  # leave at least this much of /dev/shm (RAM) free for everything else
+_ROW_BITS_PER_PIXEL = 1.0  # generous upper bound for the rows' CRF-coded H.264
+
+def _scratch_dir(need_bytes: int = 0) -> Optional[str]:
+    """
+    RAM-backed directory for intermediate row files when it can hold need_bytes and still
+    keep _SHM_MIN_FREE spare, else the default temp dir (disk).
+    """
+    shm = "/dev/shm"
+    try:
+        if os.path.isdir(shm) and os.access(shm, os.W_OK) and shutil.disk_usage(shm).free >= need_bytes + _SHM_MIN_FREE:
+            return shm
+    except OSError:
+        pass
+    return None
+
+def _encoder_threads() -> int:
+    # libx264 stops scaling past ~8 threads
+    return min(8, os.cpu_count() or 4)
+
+def _write_row_clip(clip, fname: str, fps: int, hwaccel: bool = False, quality: str = "final"):
+    """
+    Encode one row with moviepy using the same encoder and stream params as the ffmpeg
+    batches, so the concat step can stream-copy a mix of both.
+    """
+    x264 = _x264_args(quality)
+    kw: Dict[str, Any] = {"codec": "libx264", "preset": x264[3], "ffmpeg_params": x264[4:] + _row_params(fps)}
+    if hwaccel:
+        from moviepy.config import get_setting
+        _, enc = _hw_codec_args(get_setting("FFMPEG_BINARY"), True, quality)
+        if enc[1] != "libx264":
+            kw = {"codec": enc[1], "ffmpeg_params": enc[2:] + _row_params(fps)}
+    clip.write_videofile(fname, fps=fps, audio=False, write_logfile=False, threads=_encoder_threads(),
+                         verbose=False, logger=None, **kw)
+
+def _write_moviepy(clips, audio, out_path: str, fps:int=24, hwaccel: bool=False, quality: str = "final"):
+    video = _mp().concatenate_videoclips(clips, method="compose")
     video = video.set_audio(audio)
     ensure_dir(os.path.dirname(out_path) or ".")
-    video.write_videofile(out_path, fps=fps, audio_codec="aac")
+    x264 = _x264_args(quality)
+    kw: Dict[str, Any] = {"preset": x264[3], "ffmpeg_params": x264[4:] + ["-movflags", "+faststart"]}
+    if hwaccel:
+        # moviepy may run its own ffmpeg binary; probe that one for encoders
+        from moviepy.config import get_setting
+        _, enc = _hw_codec_args(get_setting("FFMPEG_BINARY"), True, quality)
+        if enc[1] != "libx264":
+            kw = {"codec": enc[1], "ffmpeg_params": enc[2:] + ["-pix_fmt", "yuv420p", "-movflags", "+faststart"]}
+    video.write_videofile(out_path, fps=fps, audio_codec="aac", write_logfile=False, threads=_encoder_threads(),
+                          verbose=False, logger=None, **kw)
     try: video.close()
     except Exception: pass
 
-def _ffmpeg_stream_clip(clip, audio_file: Optional[str], out_path: str, fps: int, size: Tuple[int,int]):
+# BT.601 limited range, the matrix swscale uses for rgb24 -> yuv420p by default
+_YUV_MATRIX = np.array([[0.257, 0.504, 0.098],
+                        [-0.148, -0.291, 0.439],
+                        [0.439, -0.368, -0.071]], dtype=np.float32).T
+_YUV_OFFSET = np.array([16.5, 128.5, 128.5], dtype=np.float32)  # +0.5: the uint8 store truncates, so this rounds
+
+def _rgb_to_i420(frame: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Convert an (h, w, 3) uint8 RGB frame into the planar I420 buffer out (h*3/2, w)."""
+    if cv2 is not None:
+        return cv2.cvtColor(frame, cv2.COLOR_RGB2YUV_I420, dst=out)
+    h, w = frame.shape[:2]
+    yuv = frame.reshape(-1, 3).astype(np.float32) @ _YUV_MATRIX
+    yuv += _YUV_OFFSET
+    yuv = yuv.reshape(h, w, 3)
+    flat = out.reshape(-1)
+    np.clip(yuv[:, :, 0], 0, 255, out=yuv[:, :, 0])
+    flat[:h * w] = yuv[:, :, 0].reshape(-1)
+    # chroma: average each 2x2 block
+    uv = yuv[:, :, 1:].reshape(h // 2, 2, w // 2, 2, 2).mean(axis=(1, 3))
+    np.clip(uv, 0, 255, out=uv)
+    q = (h // 2) * (w // 2)
+    flat[h * w:h * w + q] = uv[:, :, 0].reshape(-1)
+    flat[h * w + q:] = uv[:, :, 1].reshape(-1)
+    return out
+
+def _resize_frame(frame: np.ndarray, size: Tuple[int,int]) -> np.ndarray:
+    """Resize one uint8 RGB frame directly (cv2 when available, else PIL) without a moviepy clip."""
+    if cv2 is not None:
+        return cv2.resize(np.ascontiguousarray(frame), tuple(size), interpolation=cv2.INTER_AREA)
+    from PIL import Image
+    return np.asarray(Image.fromarray(frame).resize(tuple(size), Image.BILINEAR))
+
+_HAS_WRITEV = hasattr(os, "writev")
+_WRITEV_FRAMES = 64  # frames per writev call, well under IOV_MAX
+_PIPE_TARGET_FRAMES = 8  # frames the stdin pipe can hold before the producer blocks
+
+def _grow_pipe(fd: int, nbytes: int):
+    """Enlarge a pipe's kernel buffer (Linux only; capped by /proc/sys/fs/pipe-max-size)."""
+    setsz = getattr(fcntl, "F_SETPIPE_SZ", 1031) if fcntl is not None else None
+    if setsz is None or not sys.platform.startswith("linux"):
+        return
+    try:
+        with open("/proc/sys/fs/pipe-max-size") as fh:
+            nbytes = min(nbytes, int(fh.read()))
+    except (OSError, ValueError):
+        pass
+    try:
+        fcntl.fcntl(fd, setsz, nbytes)
+    except OSError:
+        pass  # keep the default 64 KiB
+
+class _FramePipe:
     """
-    Stream a moviepy VideoClip to ffmpeg stdin to produce out_path.
+    One long-lived ffmpeg encoder fed raw frames on stdin (optionally muxing an audio file).
+    Frames are converted to yuv420p before piping (half the bytes of rgb24, and no
+    conversion inside the encoder); odd frame sizes fall back to rgb24.
+    Use as a context manager; leaving the block without an error finishes the file.
     """
-    ff = _ffmpeg_exe()
+
+    def __init__(self, ff: str, size: Tuple[int,int], fps: int, out_path: str,
+                 audio_file: Optional[str] = None, hwaccel: bool = False, quality: str = "final"):
+        w, h = size
+        self.size = (w, h)
+        self.i420 = w % 2 == 0 and h % 2 == 0
+        self._buf = np.empty((h * 3 // 2, w), dtype=np.uint8) if self.i420 else None
+        self._last_in = self._last_out = None
+        pix_fmt = "yuv420p" if self.i420 else "rgb24"
+        cmd = [ff, "-y", "-loglevel", "error",
+               "-f", "rawvideo", "-pix_fmt", pix_fmt, "-s", f"{w}x{h}", "-r", str(fps), "-i", "-"]
+        _, enc = _hw_codec_args(ff, hwaccel, quality)
+        if audio_file and os.path.exists(audio_file):
+            cmd += ["-i", audio_file, "-map", "0:v:0", "-map", "1:a:0", "-c:a", "aac"] + enc + [out_path]
+        else:
+            cmd += enc + [out_path]
+        # unbuffered: frames are written straight from the numpy buffer, no extra copy
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, bufsize=0)
+        _grow_pipe(self.proc.stdin.fileno(), _PIPE_TARGET_FRAMES * self._frame_bytes())
+
+    def _frame_bytes(self) -> int:
+        w, h = self.size
+        return w * h * 3 // 2 if self.i420 else w * h * 3
+
+    def _prepare(self, frame: np.ndarray) -> np.ndarray:
+        w, h = self.size
+        if frame.dtype != np.uint8:
+            frame = frame.astype(np.uint8, copy=False)
+        if frame.shape[0] != h or frame.shape[1] != w:
+            frame = _resize_frame(frame[:, :, :3], self.size)
+        frame = np.ascontiguousarray(frame[:, :, :3])
+        if self.i420:
+            frame = _rgb_to_i420(frame, self._buf)
+        return frame
+
+    def write(self, frame, repeat: int = 1):
+        """Send frame repeat times; repeats go out as one gather write where the OS has writev."""
+        # still rows hand over the same array for every frame: convert it once
+        if frame is not self._last_in:
+            self._last_out = self._prepare(frame)
+            self._last_in = frame
+        view = memoryview(self._last_out).cast("B")
+        try:
+            if _HAS_WRITEV:
+                fd = self.proc.stdin.fileno()
+                while repeat > 0:
+                    views = [view] * min(repeat, _WRITEV_FRAMES)
+                    repeat -= len(views)
+                    i = 0
+                    while i < len(views):
+                        # raw pipe writes may be partial, even mid-frame
+                        n = os.writev(fd, views[i:])
+                        while i < len(views) and n >= len(views[i]):
+                            n -= len(views[i])
+                            i += 1
+                        if n:
+                            views[i] = views[i][n:]
+                return
+            for _ in range(repeat):
+                rest = view
+                while rest:
+                    rest = rest[self.proc.stdin.write(rest):]
+        except BrokenPipeError:
+            raise RuntimeError(f"ffmpeg exited early with code {self.proc.wait()}")
+
+    def close(self):
+        if self.proc.stdin and not self.proc.stdin.closed:
+            try:
+                self.proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        return self.proc.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.proc.kill()
+        rc = self.close()
+        if exc_type is None and rc != 0:
+            raise RuntimeError(f"ffmpeg exited with code {rc}")
+        return False
+
+_PREFETCH_FRAMES = 4  # frames composed ahead of the encoder in stream mode
+
+def _frame_workers() -> int:
+    # frame composition is numpy-bound (GIL released); leave a core for the encoder
+    return max(0, min(4, (os.cpu_count() or 1) - 1))
+
+def _clip_frames(clips, total: float, fps: int, size: Tuple[int,int],
+                 pool: Optional[ThreadPoolExecutor] = None) -> Iterator[Tuple[Any, int]]:
+    """
+    (frame, repeat) runs for consecutive moviepy clips (covering total seconds), padded with black.
+    Frames are sampled on the global fps grid, so row boundaries don't drift.
+    With a pool, frames of clips marked parallel (thread-safe get_frame) come back as futures.
+    """
+    ImageClip = _mp().ImageClip
+    frame_count = max(1, int(total * fps))
+    i = 0
+    start = 0.0
+    for clip in clips:
+        if clip.duration is None:
+            raise RuntimeError("Clip duration is None; cannot stream.")
+        end = start + clip.duration
+        if isinstance(clip, ImageClip):
+            # an ImageClip never changes: render it once and repeat it for the row
+            n = 0
+            while i + n < frame_count and (i + n) / fps < end:
+                n += 1
+            if n:
+                yield clip.get_frame(0), n
+                i += n
+        submit = pool.submit if pool is not None and getattr(clip, "parallel", False) else None
+        while i < frame_count and i / fps < end:
+            t = min(i / fps - start, clip.duration)
+            yield (submit(clip.get_frame, t) if submit else clip.get_frame(t)), 1
+            i += 1
+        start = end
+    if i < frame_count:
+        yield np.zeros((size[1], size[0], 3), dtype=np.uint8), frame_count - i
+
+def _prefetch(frames: Iterator[Any], depth: int = _PREFETCH_FRAMES) -> Iterator[Any]:
+    """
+    Run a frame iterator on a producer thread, keeping up to depth frames queued,
+    so composition (mostly GIL-free numpy) overlaps with piping to the encoder.
+    Producer errors are re-raised in the consumer.
+    """
+    q: Queue = Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _produce():
+        try:
+            for f in frames:
+                if not _put(f):
+                    return
+            _put(done)
+        except BaseException as e:
+            _put(e)
+
+    t = threading.Thread(target=_produce, name="modpmv-frames", daemon=True)
+    t.start()
+    try:
+        while True:
+            item = q.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        t.join()
+
+def _ffmpeg_stream_clips(clips, total: float, audio_file: Optional[str], out_path: str, fps: int,
+                         size: Tuple[int,int], hwaccel: bool=False, quality: str = "final"):
+    """Stream consecutive moviepy clips (covering total seconds) through one ffmpeg process."""
+    ff = ffmpeg_exe()
     if ff is None:
         raise RuntimeError("ffmpeg not found for stream mode.")
+    workers = _frame_workers()
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="modpmv-compose") if workers > 1 else None
+    try:
+        with _FramePipe(ff, size, fps, out_path, audio_file, hwaccel=hwaccel, quality=quality) as pipe:
+            # the queue bounds how many frames are in flight on the pool
+            depth = max(_PREFETCH_FRAMES, 2 * workers)
+            for frame, repeat in _prefetch(_clip_frames(clips, total, fps, size, pool), depth):
+                pipe.write(frame.result() if isinstance(frame, Future) else frame, repeat)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+def _image_pool(image_folders: List[str]) -> List[str]:
+    images: List[str] = []
+    for folder in image_folders:
+        images += list_assets(folder, exts=(".png", ".jpg", ".jpeg", ".bmp"))
+    return images
+
+def _image_cycle(image_pool: List[str]) -> Optional[Iterator[str]]:
+    """
+    Endless round-robin over up to IMAGE_POOL_SIZE images drawn from the pool, shuffled once
+    per render (None if the pool is empty). The cap keeps every image a render shows decoded
+    in _resized_array's cache, however large the library.
+    """
+    return itertools.cycle(random.sample(image_pool, min(len(image_pool), IMAGE_POOL_SIZE))) if image_pool else None
+
+def _pick_image(images: Optional[Iterator[str]]) -> Optional[str]:
+    return next(images) if images is not None else None
+
+def _sample_ids(patterns: List[List[List[Any]]], channels: int) -> Tuple[List[np.ndarray], List[str]]:
+    """
+    Intern every SAMPLE: token once. Returns one (rows, channels) int32 grid per
+    pattern (-1 for REST/other tokens) and the id -> sample name table.
+    """
+    names: List[str] = []
+    ids: Dict[str, int] = {}
+    grids = []
+    for pattern in patterns:
+        grid = np.full((len(pattern), channels), -1, dtype=np.int32)
+        for r, row in enumerate(pattern):
+            for ch, tok in enumerate(row[:channels]):
+                if isinstance(tok, str) and tok[:7].upper() == "SAMPLE:":
+                    name = tok.split(":", 1)[1]
+                    sid = ids.get(name)
+                    if sid is None:
+                        sid = ids[name] = len(names)
+                        names.append(name)
+                    grid[r, ch] = sid
+        grids.append(grid)
+    return grids, names
+
+def _plan_rows(grids: List[np.ndarray], order: List[int], total: float,
+               row_seconds: float) -> List[Tuple[int,int,float,float]]:
+    """(pattern, row, start, duration) for every row that fits in total seconds, in play order."""
+    plan = []
+    t = 0.0
+    for p in order:
+        if p < 0 or p >= len(grids):
+            continue
+        for r in range(grids[p].shape[0]):
+            if t >= total:
+                return plan
+            dur = min(row_seconds, total - t)
+            plan.append((p, r, t, dur))
+            t += dur
+    return plan
+
+def _channel_layout(channels: int, size: Tuple[int,int], bars: bool = False) -> Dict[str, Any]:
+    """Static per-channel placement: clip position/opacity and (when bars is set) tint bar geometry."""
+    return {
+        "size": tuple(size),
+        "bars": bars,
+        "bar_size": (int(size[0]*0.15), int(size[1]*0.07)),
+        "tints": [((ch * 37) % 255, (ch * 59) % 255, (ch * 83) % 255) for ch in range(channels)],
+        "bar_pos": [(int((ch % 8) * (size[0] * 0.02)), int((ch // 8) * (size[1] * 0.06))) for ch in range(channels)],
+        "pos": [(int((ch % 8) * (size[0] * 0.11)), int((ch // 8) * (size[1] * 0.12))) for ch in range(channels)],
+        "opacity": [0.9 - min(0.6, ch * 0.01) for ch in range(channels)],
+    }
+
+def _layer_array(path: Optional[str], ch: int, layout: Dict[str, Any]) -> np.ndarray:
+    """
+    Full-size still for a layer: the image (or the grey placeholder), with channel ch's
+    tint bar painted in when bars are on. RGBA images are flattened over black first,
+    the same as compositing image and bar as one clip.
+    """
+    w, h = layout["size"]
+    src = _resized_array(path, (w, h)) if path else np.full((h, w, 3), 10, dtype=np.uint8)
+    if ch < 0 or not layout["bars"]:
+        return src
+    out = src.copy()
+    if out.shape[2] == 4:
+        out[:, :, :3] = src[:, :, :3] * (src[:, :, 3:4] / 255.0)
+    bx, by = layout["bar_pos"][ch]
+    bw, bh = layout["bar_size"]
+    out[by:by + bh, bx:bx + bw] = tuple(layout["tints"][ch]) + ((255,) if out.shape[2] == 4 else ())
+    return out
+
+def _blend(canvas: np.ndarray, src: np.ndarray, x: int, y: int, opacity: float):
+    """Blend a full-size RGB(A) uint8 layer at (x, y) onto a float canvas, CompositeVideoClip style."""
+    h, w = canvas.shape[:2]
+    if x >= w or y >= h:
+        return
+    dst = canvas[y:, x:]
+    part = src[:h - y, :w - x, :3]
+    if src.shape[2] == 3 and opacity >= 1.0:
+        dst[...] = part
+        return
+    mask = opacity if src.shape[2] == 3 else src[:h - y, :w - x, 3:4] * (opacity / 255.0)
+    dst *= 1.0 - mask
+    dst += part * mask
+
+def _static_row_canvas(layers: List[Tuple[int,str,Optional[str]]], layout: Dict[str, Any]) -> np.ndarray:
+    """Still layers blended over a black float canvas (alpha * opacity, as CompositeVideoClip does)."""
+    w, h = layout["size"]
+    canvas = np.zeros((h, w, 3), dtype=np.float32)
+    for ch, kind, path in layers:
+        if kind == "background":
+            _blend(canvas, _layer_array(path, -1, layout), 0, 0, 1.0)
+        else:
+            x, y = layout["pos"][ch]
+            _blend(canvas, _layer_array(path, ch, layout), x, y, layout["opacity"][ch])
+    return canvas
+
+def _static_row_frame(layers: List[Tuple[int,str,Optional[str]]], layout: Dict[str, Any]) -> np.ndarray:
+    """
+    Precompose a row made only of still layers into one RGB frame, so the row can be a
+    single ImageClip instead of re-compositing every layer on every frame.
+    """
+    return _static_row_canvas(layers, layout).astype(np.uint8)
+
+def _decode_frames(ff: str, path: str, size: Tuple[int,int], fps: int, seconds: float) -> Optional[np.ndarray]:
+    """The first seconds of a video as an (n, h, w, 3) uint8 array at size and fps, from one ffmpeg call."""
     w, h = size
-    cmd = [
-        ff, "-y",
-        "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{w}x{h}", "-r", str(fps), "-i", "-",
-    ]
-    if audio_file and os.path.exists(audio_file):
-        cmd += ["-i", audio_file, "-map", "0:v:0", "-map", "1:a:0", "-c:a", "aac", "-c:v", "libx264", "-preset", "fast", "-crf", "18", out_path]
-    else:
-        cmd += ["-c:v", "libx264", "-preset", "fast", "-crf", "18", out_path]
+    cmd = [ff, "-v", "error", "-i", path, "-t", f"{seconds:.6f}", "-vf", f"fps={fps},scale={w}:{h}",
+           "-f", "rawvideo", "-pix_fmt", "rgb24", "-"]
+    try:
+        out = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout
+    except OSError:
+        return None
+    n = len(out) // (w * h * 3)
+    if n == 0:
+        return None
+    return np.frombuffer(out, dtype=np.uint8, count=n * w * h * 3).reshape(n, h, w, 3)
+
+_scratch = threading.local()
+
+def _scratch_canvas(shape: Tuple[int, ...]) -> np.ndarray:
+    """This thread's reusable float32 compositing canvas (contents undefined)."""
+    buf = getattr(_scratch, "canvas", None)
+    if buf is None or buf.shape != shape:
+        buf = _scratch.canvas = np.empty(shape, dtype=np.float32)
+    return buf
+
+class _NumpyRow:
+    """
+    Stand-in for a row's CompositeVideoClip when frames go straight to an encoder
+    (duration + get_frame, which is all _clip_frames needs). The still layers under the
+    first sample video are blended once; only the rest are blended per frame, in numpy.
+    video_frame(path, t) returns the sample's full-size RGB frame at row time t.
+    """
 
-    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    def __init__(self, layers: List[Tuple[int,str,Optional[str]]], duration: float,
+                 layout: Dict[str, Any], video_frame, parallel: bool = False):
+        self.duration = duration
+        self.parallel = parallel  # get_frame is thread-safe (no moviepy reader behind video_frame)
+        first = next(i for i, (_, kind, _) in enumerate(layers) if kind == "video")
+        self._base = _static_row_canvas(layers[:first], layout)
+        self._top = []
+        for ch, kind, path in layers[first:]:
+            src = None if kind == "video" else _layer_array(path, ch, layout)
+            self._top.append((path, src, layout["pos"][ch], layout["opacity"][ch]))
+        self._video_frame = video_frame
+
+    def get_frame(self, t: float) -> np.ndarray:
+        canvas = _scratch_canvas(self._base.shape)
+        np.copyto(canvas, self._base)
+        for path, src, (x, y), opacity in self._top:
+            _blend(canvas, src if src is not None else self._video_frame(path, t), x, y, opacity)
+        return canvas.astype(np.uint8)
+
+def _row_filter_graph(layers: List[Tuple[int,str,Optional[str]]], seg_dur: float, fps: int,
+                      layout: Dict[str, Any], decode_args: List[str] = (),
+                      first_input: int = 0, tag: str = "", gpu_scale: bool = False) -> Tuple[List[str], str]:
+    """
+    Build ffmpeg input args and filter_complex chains compositing one row into [{tag}out].
+    layers are (channel, kind, path) with kind "background", "video" or "image"
+    (path None = flat color). Mirrors the moviepy composite: the row background,
+    then each channel scaled to full size, offset to its position and faded to its
+    opacity; with layout["bars"], image channels (samples without a video) get a tint bar
+    and, like _layer_array, have their colour premultiplied by alpha.
+    Input indices start at first_input and labels are prefixed with tag so several
+    rows can share one graph. With gpu_scale, video inputs stay on the GPU through
+    decode and scale_cuda and only the scaled frames are downloaded.
+    """
+    w, h = layout["size"]
+    bw, bh = layout["bar_size"]
+    dur = f"{seg_dur:.6f}"
+    inputs: List[str] = []
+    index: Dict[str, int] = {}
+    uses: Dict[str, int] = {}
+    for _, kind, path in layers:
+        if path is None:
+            continue
+        if path not in index:
+            index[path] = first_input + len(index)
+            if kind == "video":
+                hw_out = ["-hwaccel_output_format", "cuda"] if gpu_scale else []
+                inputs += list(decode_args) + hw_out + ["-stream_loop", "-1", "-t", dur, "-i", path]
+            else:
+                inputs += ["-loop", "1", "-framerate", str(fps), "-t", dur, "-i", path]
+        uses[path] = uses.get(path, 0) + 1
+    chains = [f"color=c=black:s={w}x{h}:r={fps}:d={dur}[{tag}b0]"]
+    for path, i in index.items():
+        outs = "".join(f"[{tag}s{i}_{k}]" for k in range(uses[path]))
+        video = any(kind == "video" for _, kind, p in layers if p == path)
+        scale = f"scale_cuda={w}:{h},hwdownload,format=nv12" if gpu_scale and video else f"scale={w}:{h}"
+        chains.append(f"[{i}:v]{scale},setsar=1,fps={fps},format=rgba,split={uses[path]}{outs}")
+    taken: Dict[str, int] = {}
+    for n, (ch, kind, path) in enumerate(layers):
+        if path is None:
+            src = f"color=c=0x0a0a0a:s={w}x{h}:r={fps}:d={dur},format=rgba"
+        else:
+            k = taken.get(path, 0); taken[path] = k + 1
+            src = f"[{tag}s{index[path]}_{k}]"
+        filters = []
+        if kind == "image" and layout["bars"]:
+            r, g, b = layout["tints"][ch]
+            bx, by = layout["bar_pos"][ch]
+            # replace=1: the bar is opaque even over transparent pixels; then flatten the image
+            # over black (rgb * alpha) like _layer_array, which the composite blends by alpha again
+            filters.append(f"drawbox=x={bx}:y={by}:w={bw}:h={bh}:color=0x{r:02x}{g:02x}{b:02x}:t=fill:replace=1")
+            filters.append("premultiply=inplace=1")
+        if kind == "background":
+            x, y = 0, 0
+            filters.append("null")
+        else:
+            x, y = layout["pos"][ch]
+            filters.append(f"colorchannelmixer=aa={layout['opacity'][ch]:.3f}")
+        chains.append(f"{src}{',' if path is None else ''}{','.join(filters)}[{tag}c{n}]")
+        chains.append(f"[{tag}b{n}][{tag}c{n}]overlay=x={x}:y={y}:eof_action=repeat[{tag}b{n+1}]")
+    chains.append(f"[{tag}b{len(layers)}]format=yuv420p[{tag}out]")
+    return inputs, ";".join(chains)
+
+def _ffmpeg_rows(ff: str, rows: List[Tuple[List[Tuple[int,str,Optional[str]]], float]], fps: int,
+                 layout: Dict[str, Any], out_path: str, hwaccel: bool = False, quality: str = "final") -> bool:
+    """
+    Composite a run of (layers, seg_dur) rows and concat them inside one ffmpeg process.
+    Returns False on failure.
+    """
+    dec, enc = _hw_codec_args(ff, hwaccel, quality)
+    gpu_scale = dec == ["-hwaccel", "cuda"] and "scale_cuda" in _ffmpeg_filters(ff)
+    inputs: List[str] = []
+    chains: List[str] = []
+    for n, (layers, seg_dur) in enumerate(rows):
+        row_inputs, graph = _row_filter_graph(layers, seg_dur, fps, layout, dec,
+                                              first_input=inputs.count("-i"), tag=f"r{n}", gpu_scale=gpu_scale)
+        inputs += row_inputs
+        chains.append(graph)
+    chains.append("".join(f"[r{n}out]" for n in range(len(rows))) + f"concat=n={len(rows)}:v=1:a=0[outv]")
+    cmd = [ff, "-y", "-loglevel", "error"] + inputs + [
+        "-filter_complex", ";".join(chains), "-map", "[outv]"] + enc + _row_params(fps) + ["-an", out_path]
     try:
-        duration = clip.duration
-        if duration is None:
-            raise RuntimeError("Clip duration is None; cannot stream.")
-        frame_count = max(1, int(duration * fps))
-        for i in range(frame_count):
-            t = i / fps
-            frame = clip.get_frame(t)  # HxWx3 uint8
-            # Ensure frame is HxW matching requested size
-            if frame.shape[0] != h or frame.shape[1] != w:
-                # use moviepy to resize a single-frame clip (cheap)
-                from moviepy.editor import ImageClip
-                frame = np.asarray(ImageClip(frame).resize(newsize=size).get_frame(0))
-            proc.stdin.write(frame.astype(np.uint8).tobytes())
-        proc.stdin.close()
-        rc = proc.wait()
-        if rc != 0:
-            raise RuntimeError(f"ffmpeg exited with code {rc}")
-    finally:
-        try:
-            if proc.stdin and not proc.stdin.closed:
-                proc.stdin.close()
-        except Exception:
-            pass
+        proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError:
+        return False
+    return proc.returncode == 0 and os.path.exists(out_path)
+
+def _run_tail(cmd: List[str], tail: int = 64 * 1024) -> Tuple[int, str]:
+    """Run cmd, keeping only the last tail bytes of its stderr for error messages."""
+    proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    buf = bytearray()
+    with proc.stderr:
+        for chunk in iter(lambda: proc.stderr.read1(8192), b""):
+            buf += chunk
+            if len(buf) > 2 * tail:
+                del buf[:-tail]
+    return proc.wait(), bytes(buf[-tail:]).decode("utf-8", "replace")
+
+def _ffconcat_quote(path: str) -> str:
+    # ffmpeg tokens: nothing is special inside '...', so a quote is closed, escaped and reopened
+    return "'" + path.replace("'", "'\\''") + "'"
 
-def _ffmpeg_concat(video_files: List[str], out_path: str, audio_file: Optional[str]=None):
-    ff = _ffmpeg_exe()
+def _ffmpeg_concat(video_files: List[str], out_path: str, audio_file: Optional[str]=None, hwaccel: bool=False,
+                   quality: str = "final"):
+    ff = ffmpeg_exe()
     if not ff:
         raise RuntimeError("ffmpeg not found on PATH and imageio-ffmpeg not available.")
     tmpdir = tempfile.mkdtemp(prefix="modpmv_ff_")
     listfile = os.path.join(tmpdir, "inputs.txt")
     try:
         with open(listfile, "w", encoding="utf-8") as fh:
+            fh.write("ffconcat version 1.0\n")
             for vf in video_files:
-                safe = os.path.abspath(vf).replace("'", "\\'")
-                fh.write("file '{}'\n".format(safe))
-        cmd = [ff, "-y", "-f", "concat", "-safe", "0", "-i", listfile, "-c", "copy", out_path]
-        proc = subprocess.run(cmd, capture_output=True, text=True)
-        if proc.returncode != 0:
-            cmd2 = [ff, "-y", "-f", "concat", "-safe", "0", "-i", listfile, "-c:v", "libx264", "-preset", "fast", "-crf", "18", out_path]
-            proc2 = subprocess.run(cmd2, capture_output=True, text=True)
-            if proc2.returncode != 0:
-                raise RuntimeError(f"ffmpeg concat failed:\ncopy stderr:\n{proc.stderr}\nre-encode stderr:\n{proc2.stderr}")
+                fh.write("file {}\n".format(_ffconcat_quote(os.path.abspath(vf))))
+        # audio is muxed in the same pass; row files share _row_params, so stream
+        # copy is the normal path and the re-encode is only a safety net
+        audio_in: List[str] = []
+        audio_out: List[str] = []
         if audio_file and os.path.exists(audio_file):
-            mux_out = out_path.replace(".mp4", "_mux.mp4")
-            cmd3 = [ff, "-y", "-i", out_path, "-i", audio_file, "-c:v", "copy", "-c:a", "aac", "-map", "0:v:0", "-map", "1:a:0", mux_out]
-            proc3 = subprocess.run(cmd3, capture_output=True, text=True)
-            if proc3.returncode == 0:
-                shutil.move(mux_out, out_path)
-            else:
-                raise RuntimeError(f"ffmpeg mux failed: {proc3.stderr}")
+            audio_in = ["-i", audio_file]
+            audio_out = ["-map", "0:v:0", "-map", "1:a:0", "-c:a", "aac"]
+        cmd = [ff, "-y", "-hide_banner", "-f", "concat", "-safe", "0", "-i", listfile] + audio_in + audio_out + ["-c:v", "copy", out_path]
+        rc, err = _run_tail(cmd)
+        if rc != 0:
+            dec, enc = _hw_codec_args(ff, hwaccel, quality)
+            cmd2 = [ff, "-y", "-hide_banner"] + dec + ["-f", "concat", "-safe", "0", "-i", listfile] + audio_in + audio_out + enc + [out_path]
+            rc2, err2 = _run_tail(cmd2)
+            if rc2 != 0:
+                raise RuntimeError(f"ffmpeg concat failed:\ncopy stderr:\n{err}\nre-encode stderr:\n{err2}")
     finally:
         shutil.rmtree(tmpdir, ignore_errors=True)
 
+def _ffmpeg_solid(color: Tuple[int,int,int], total: float, audio_file: Optional[str], out_path: str, fps: int,
+                  size: Tuple[int,int], hwaccel: bool = False, quality: str = "final") -> bool:
+    """Constant-colour video (plus audio) straight from ffmpeg's lavfi color source; False if ffmpeg failed."""
+    ff = ffmpeg_exe()
+    if not ff or total <= 0:
+        return False
+    src = "color=c=0x{:02x}{:02x}{:02x}:s={}x{}:r={}:d={:.6f}".format(*color, size[0], size[1], fps, total)
+    _, enc = _hw_codec_args(ff, hwaccel, quality)
+    cmd = [ff, "-y", "-hide_banner", "-f", "lavfi", "-i", src]
+    if audio_file and os.path.exists(audio_file):
+        cmd += ["-i", audio_file, "-map", "0:v:0", "-map", "1:a:0", "-c:a", "aac"]
+    rc, _ = _run_tail(cmd + enc + ["-pix_fmt", "yuv420p", out_path])
+    return rc == 0
+
 def render_video_from_module_data(module_data: Dict[str, Any],
                                   audio_path: str,
                                   video_asset_folders: List[str],
@@ -132,133 +801,262 @@ def render_video_from_module_data(module_data: Dict[str, Any],
                                   size: Tuple[int,int] = DEFAULT_SIZE,
                                   row_seconds: float = DEFAULT_ROW_SECONDS,
                                   visual_plugins: Optional[List] = None,
-                                  mode: str = "moviepy") -> Tuple[str, List[str], List[Dict[str,Any]]]:
+                                  mode: str = "moviepy",
+                                  hwaccel: bool = False,
+                                  audio_duration: Optional[float] = None,
+                                  debug_overlay: bool = False,
+                                  quality: str = "final") -> Tuple[str, List[str], List[Dict[str,Any]]]:
     """
     Render video. Modes: "moviepy", "ffmpeg" (concat), "stream" (ffmpeg stdin).
+    hwaccel=True uses a hardware H.264 encoder (VideoToolbox/NVENC/QSV/AMF) for every encode when one works here.
+    audio_duration (seconds), when the caller already knows it, saves opening the audio just to measure it.
+    debug_overlay=True draws the per-channel tint bars on channels whose sample has no video.
+    quality picks the libx264 preset/CRF: "preview" (ultrafast), "final" (fast) or "archive" (medium).
     Returns (out_path, used_video_files, timeline).
     """
     if not os.path.exists(audio_path):
         raise FileNotFoundError(audio_path)
-    audio = AudioFileClip(audio_path)
-    total = audio.duration
-    clips = []
-    used_video_files: List[str] = []
+    mp = _mp()
+    ff_available = ffmpeg_exe() is not None
+    if mode == "stream" and not ff_available:
+        mode = "moviepy"
+    # the audio clip is only needed to mux in moviepy mode; ffmpeg modes read the file directly
+    audio = mp.AudioFileClip(audio_path) if audio_duration is None or mode == "moviepy" else None
+    total = audio_duration if audio_duration is not None else audio.duration
+    used_video_files: Dict[str, None] = {}  # insertion-ordered set
     timeline: List[Dict[str,Any]] = []
 
     channels = int(module_data.get("channels", 32))
     patterns = module_data.get("patterns", [])
     order = module_data.get("order", list(range(len(patterns))))
-    t = 0.0
-
-    ff_available = _ffmpeg_exe() is not None
-    if mode == "stream" and not ff_available:
-        mode = "moviepy"
 
     temp_files: List[str] = []
-    tmpdir = tempfile.mkdtemp(prefix="modpmv_rows_") if mode == "ffmpeg" else None
+    row_jobs: List[Tuple[List[Tuple[int,str,Optional[str]]], float, Dict[str,Any]]] = []
+    # estimated size of all row files, so a long HD render doesn't fill /dev/shm
+    row_bytes = int(total * fps * size[0] * size[1] * _ROW_BITS_PER_PIXEL / 8)
+    tmpdir = tempfile.mkdtemp(prefix="modpmv_rows_", dir=_scratch_dir(row_bytes)) if mode == "ffmpeg" else None
 
-    try:
-        for patt_idx in order:
-            if patt_idx < 0 or patt_idx >= len(patterns):
+    layout = _channel_layout(channels, size, bars=debug_overlay)
+    grids, sample_names = _sample_ids(patterns, channels)
+    plan = _plan_rows(grids, order, total, row_seconds)
+    # resolve each distinct sample that actually plays to its video once, indexed by sample id
+    distinct = np.unique(np.stack([grids[p][r] for p, r, _, _ in plan])) if plan else ()
+    video_index: List[Optional[str]] = [None] * len(sample_names)
+    durations: Dict[str, Optional[float]] = {}
+    can_probe = ff_available or ffprobe_exe() is not None
+    for sid in distinct:
+        if sid < 0:
+            continue
+        vf = find_video_for_sample(sample_names[sid], video_asset_folders)
+        if vf and vf not in durations:
+            durations[vf] = _probe_duration(vf)  # None for a file that has gone missing, too
+        # unreadable, empty or missing videos fall back to the image layer up front
+        video_index[sid] = vf if vf and (durations[vf] or not can_probe and os.path.exists(vf)) else None
+    bar_cache: Dict[Tuple[Optional[str],int], Any] = {}
+    # one reader per distinct asset for the whole render; rows take subclips of it.
+    # Not shared across threads: moviepy readers aren't thread-safe.
+    vf_cache: Dict[str, Any] = {}
+    # image folders are listed once per render; decoded+resized images are reused across rows
+    images = _image_cycle(_image_pool(image_asset_folders))
+    img_cache: Dict[str, Any] = {}
+    ff = ffmpeg_exe() if mode == "ffmpeg" else None
+    # stream mode: the visible head of each sample, decoded to (n, h, w, 3) frames once per render
+    stream_ff = ffmpeg_exe() if mode == "stream" else None
+    sample_frames: Dict[str, np.ndarray] = {}
+
+    def _barred_clip(path: Optional[str], ch: int, dur: float):
+        # image with the channel's tint bar painted in once, not composited per frame
+        key = (path, ch)
+        clip = bar_cache.get(key)
+        if clip is None:
+            clip = bar_cache[key] = mp.ImageClip(_layer_array(path, ch, layout))
+        return clip.set_duration(dur)
+
+    def _compose_row(layers, seg_dur: float, used_this_row: List[str]):
+        if all(kind != "video" for _, kind, _ in layers):
+            # nothing moves in this row: blend it once instead of per frame. REST-only rows
+            # too, so an RGBA background is flattened over black exactly once in every mode
+            return mp.ImageClip(_static_row_frame(layers, layout)).set_duration(seg_dur)
+        per = []
+        for ch, kind, path in layers:
+            if kind == "background":
+                per.append(_image_clip(path, seg_dur, size, img_cache))
                 continue
-            pattern = patterns[patt_idx]
-            for row_idx, row in enumerate(pattern):
-                if t >= total:
-                    break
-                seg_dur = min(row_seconds, total - t)
-                per = []
-                used_this_row = []
-                for ch in range(channels):
-                    token = row[ch] if ch < len(row) else "REST"
-                    chosen_sample = None
-                    if isinstance(token, str) and token.upper().startswith("SAMPLE:"):
-                        chosen_sample = token.split(":",1)[1]
+            clip = None
+            if kind == "video":
+                try:
+                    v = vf_cache.get(path)
+                    if v is None:
+                        v = vf_cache[path] = mp.VideoFileClip(path)
+                    vdur = durations.get(path) or v.duration
+                    if vdur > seg_dur:
+                        v = v.subclip(0, seg_dur)
+                    elif vdur > 0:
+                        # time-wrap the one reader (t % duration) instead of concatenating copies
+                        v = v.loop(duration=seg_dur)
+                    else:
+                        v = v.set_duration(seg_dur)
+                    clip = v.resize(newsize=size).set_duration(seg_dur)
+                    used_this_row.append(path); used_video_files[path] = None
+                except Exception:
                     clip = None
-                    if chosen_sample:
-                        vf = find_video_for_sample(chosen_sample, video_asset_folders)
-                        if vf and os.path.exists(vf):
-                            try:
-                                v = VideoFileClip(vf)
-                                if v.duration > seg_dur:
-                                    v = v.subclip(0, seg_dur)
-                                else:
-                                    if v.duration > 0:
-                                        repeats = int(seg_dur // v.duration)
-                                        parts = [v] * repeats
-                                        rem = seg_dur - repeats * v.duration
-                                        if rem > 0:
-                                            parts.append(v.subclip(0, rem))
-                                        v = concatenate_videoclips(parts)
-                                    else:
-                                        v = v.set_duration(seg_dur)
-                                clip = v.resize(newsize=size).set_duration(seg_dur)
-                                used_this_row.append(vf); used_video_files.append(vf)
-                            except Exception:
-                                clip = None
-                    if clip is None:
-                        clip = _image_clip_for_row(image_asset_folders, seg_dur, size)
-                        tint = ((ch * 37) % 255, (ch * 59) % 255, (ch * 83) % 255)
-                        bar = ColorClip(size=(int(size[0]*0.15), int(size[1]*0.07)), color=tint).set_duration(seg_dur)
-                        pos_x = int((ch % 8) * (size[0] * 0.02)); pos_y = int((ch // 8) * (size[1] * 0.06))
-                        bar = bar.set_pos((pos_x, pos_y))
-                        clip = CompositeVideoClip([clip, bar], size=size).set_duration(seg_dur)
-                    def pos_fn_factory(ci):
-                        def pos_fn(tt):
-                            x = int((ci % 8) * (size[0] * 0.11)); y = int((ci // 8) * (size[1] * 0.12)); return (x, y)
-                        return pos_fn
-                    clip = clip.set_pos(pos_fn_factory(ch))
-                    clip = clip.set_opacity(0.9 - min(0.6, ch * 0.01))
-                    per.append((ch, clip))
-                comp = CompositeVideoClip([c for _,c in sorted(per, key=lambda x: x[0])], size=size).set_duration(seg_dur)
-                if visual_plugins:
-                    for vp in visual_plugins:
-                        try:
-                            if hasattr(vp, "apply"):
-                                comp = vp.apply(comp)
-                            elif hasattr(vp, "render"):
-                                cand = vp.render(audio_path, seg_dur, size)
-                                if cand:
-                                    comp = cand.set_duration(seg_dur)
-                        except Exception:
-                            continue
-                timeline.append({"start": t, "duration": seg_dur, "used_files": list(dict.fromkeys(used_this_row)), "pattern_index": patt_idx, "row_index": row_idx})
-                if mode == "ffmpeg":
-                    fname = os.path.join(tmpdir, f"row_{len(temp_files):05d}.mp4")
-                    comp.write_videofile(fname, fps=fps, audio=False, verbose=False, logger=None)
-                    temp_files.append(fname)
+            if clip is None:
+                still = path if kind == "image" else _pick_image(images)
+                clip = _barred_clip(still, ch, seg_dur) if debug_overlay else _image_clip(still, seg_dur, size, img_cache)
+            per.append(_place(clip, layout["pos"][ch], layout["opacity"][ch]))
+        return mp.CompositeVideoClip(per, size=size).set_duration(seg_dur)
+
+    def _video_frame(path: str, t: float) -> np.ndarray:
+        frames = sample_frames.get(path)
+        if frames is not None:
+            vdur = durations.get(path) or len(frames) / fps
+            return frames[min(int((t % vdur) * fps + 1e-6), len(frames) - 1)]
+        v = vf_cache[path]
+        vdur = durations.get(path) or v.duration
+        # same timing as _compose_row: subclip(0, seg) or loop(), i.e. t wrapped at the sample's end
+        return _resize_frame(v.get_frame(t % vdur if vdur and vdur > 0 else t)[:, :, :3], size)
+
+    def _load_sample(path: str):
+        """Decode the part of a sample rows can show (its first row_seconds) once per render; else open a reader."""
+        if path in sample_frames or path in vf_cache:
+            return
+        vdur = durations.get(path)
+        if stream_ff and vdur:
+            seconds = min(vdur, row_seconds) + 1.0 / fps
+            need = (int(seconds * fps) + 1) * size[0] * size[1] * 3
+            # decoded heads stay for the whole render; past the budget, samples get a reader instead
+            if sum(f.nbytes for f in sample_frames.values()) + need <= SAMPLE_FRAMES_BUDGET:
+                frames = _decode_frames(stream_ff, path, size, fps, seconds)
+                if frames is not None:
+                    sample_frames[path] = frames
+                    return
+        vf_cache[path] = mp.VideoFileClip(path)
+
+    def _numpy_row(layers, seg_dur: float, used_this_row: List[str]):
+        """Row for stream mode without plugins: composed per frame in numpy, no moviepy clip tree."""
+        resolved = []
+        for ch, kind, path in layers:
+            if kind == "video":
+                try:
+                    _load_sample(path)
+                    used_this_row.append(path); used_video_files[path] = None
+                except Exception:
+                    kind, path = "image", _pick_image(images)
+            resolved.append((ch, kind, path))
+        if all(kind != "video" for _, kind, _ in resolved):
+            return _compose_row(resolved, seg_dur, used_this_row)
+        parallel = all(path in sample_frames for _, kind, path in resolved if kind == "video")
+        return _NumpyRow(resolved, seg_dur, layout, _video_frame, parallel=parallel)
+
+    def _row_clips():
+        """Compose rows in order (ffmpeg-mode rows are only planned here); yields one clip per composed row."""
+        for patt_idx, row_idx, t, seg_dur in plan:
+            used_this_row = []
+            # REST channels add nothing; only channels playing a sample get a layer
+            layers = [(-1, "background", _pick_image(images))]
+            row = grids[patt_idx][row_idx]
+            for ch in np.flatnonzero(row >= 0).tolist():
+                vf = video_index[row[ch]]
+                if vf:
+                    layers.append((ch, "video", vf))
                 else:
-                    clips.append(comp)
-                t += seg_dur
-            if t >= total:
-                break
+                    layers.append((ch, "image", _pick_image(images)))
+            if ff and not visual_plugins:
+                # rows are composited by ffmpeg filter graphs in batches after the loop
+                used_this_row = [path for _, kind, path in layers if kind == "video"]
+                used_video_files.update(dict.fromkeys(used_this_row))
+                entry = {"start": t, "duration": seg_dur, "used_files": list(dict.fromkeys(used_this_row)), "pattern_index": patt_idx, "row_index": row_idx}
+                timeline.append(entry)
+                row_jobs.append((layers, seg_dur, entry))
+                continue
+            if mode == "stream" and not visual_plugins:
+                comp = _numpy_row(layers, seg_dur, used_this_row)
+            else:
+                comp = _compose_row(layers, seg_dur, used_this_row)
+            if visual_plugins:
+                for vp in visual_plugins:
+                    try:
+                        if hasattr(vp, "apply"):
+                            comp = vp.apply(comp)
+                        elif hasattr(vp, "render"):
+                            cand = vp.render(audio_path, seg_dur, size)
+                            if cand:
+                                comp = cand.set_duration(seg_dur)
+                    except Exception:
+                        continue
+            timeline.append({"start": t, "duration": seg_dur, "used_files": list(dict.fromkeys(used_this_row)), "pattern_index": patt_idx, "row_index": row_idx})
+            yield comp
+
+    # nothing can vary between frames (no rows at all, or only grey placeholders with no
+    # video, images or bars): one lavfi color source replaces the whole clip tree
+    solid = None
+    if not visual_plugins and ff_available:
+        if not plan:
+            solid = (0, 0, 0)
+        elif images is None and not debug_overlay and not any(video_index[s] for s in distinct if s >= 0):
+            solid = (10, 10, 10)
 
-        final_clip = concatenate_videoclips(clips, method="compose") if clips else ColorClip(size=size, color=(0,0,0)).set_duration(total)
+    try:
+        if solid is not None and _ffmpeg_solid(solid, total, audio_path, out_path, fps, size, hwaccel=hwaccel, quality=quality):
+            timeline = [{"start": t, "duration": seg_dur, "used_files": [], "pattern_index": patt_idx, "row_index": row_idx}
+                        for patt_idx, row_idx, t, seg_dur in plan]
+            return out_path, [], timeline
+        rows = _row_clips()
+        if mode == "stream":
+            # rows are composed as the encoder consumes them; none are kept around
+            _ffmpeg_stream_clips(rows, total, audio_path, out_path, fps, size, hwaccel=hwaccel, quality=quality)
+        elif mode == "ffmpeg":
+            for comp in rows:
+                fname = os.path.join(tmpdir, f"row_{len(temp_files):05d}.mp4")
+                _write_row_clip(comp, fname, fps, hwaccel=hwaccel, quality=quality)
+                temp_files.append(fname)
+        else:
+            clips = list(rows)
+
+        if row_jobs:
+            # each batch is an independent ffmpeg process; threads are enough to keep them all busy
+            batches = [row_jobs[i:i + ROWS_PER_FFMPEG] for i in range(0, len(row_jobs), ROWS_PER_FFMPEG)]
+            names = [os.path.join(tmpdir, f"rows_{i:05d}.mp4") for i in range(len(batches))]
+            def _encode(i):
+                return _ffmpeg_rows(ff, [(layers, seg_dur) for layers, seg_dur, _ in batches[i]], fps, layout, names[i], hwaccel=hwaccel, quality=quality)
+            workers = min(len(batches), MAX_FFMPEG_JOBS, max(1, (os.cpu_count() or 2) // 2))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_encode, range(len(batches))))
+            for batch, fname, ok in zip(batches, names, results):
+                if ok:
+                    temp_files.append(fname)
+                    continue
+                for layers, seg_dur, entry in batch:
+                    fname = os.path.join(tmpdir, f"row_{len(temp_files):05d}.mp4")
+                    used_this_row = []
+                    _write_row_clip(_compose_row(layers, seg_dur, used_this_row), fname, fps, hwaccel=hwaccel, quality=quality)
+                    entry["used_files"] = list(dict.fromkeys(used_this_row))
+                    temp_files.append(fname)
 
         if mode == "moviepy":
-            _write_moviepy([final_clip], audio, out_path, fps=fps)
-        elif mode == "stream":
-            _ffmpeg_stream_clip(final_clip, audio_path, out_path, fps, size)
-        else:  # ffmpeg concat
+            final_clip = mp.concatenate_videoclips(clips, method="compose") if clips else mp.ColorClip(size=size, color=(0,0,0)).set_duration(total)
+            _write_moviepy([final_clip], audio, out_path, fps=fps, hwaccel=hwaccel, quality=quality)
+        elif mode == "ffmpeg":
             if not temp_files:
                 tmp_single = os.path.join(tmpdir, "blank.mp4")
-                ColorClip(size=size, color=(0,0,0)).set_duration(total).write_videofile(tmp_single, fps=fps, audio=False, verbose=False, logger=None)
+                _write_row_clip(mp.ColorClip(size=size, color=(0,0,0)).set_duration(total), tmp_single, fps, hwaccel=hwaccel, quality=quality)
                 temp_files = [tmp_single]
-            _ffmpeg_concat(temp_files, out_path, audio_file=audio_path)
+            _ffmpeg_concat(temp_files, out_path, audio_file=audio_path, hwaccel=hwaccel, quality=quality)
 
     finally:
-        try: audio.close()
-        except Exception: pass
+        if audio is not None:
+            try: audio.close()
+            except Exception: pass
+        for v in vf_cache.values():
+            try: v.close()
+            except Exception: pass
         try:
             if tmpdir and os.path.isdir(tmpdir):
                 shutil.rmtree(tmpdir, ignore_errors=True)
         except Exception:
             pass
 
-    seen = set(); unique_used = []
-    for f in used_video_files:
-        if f not in seen:
-            seen.add(f); unique_used.append(f)
-    return out_path, unique_used, timeline
+    return out_path, list(used_video_files), timeline
 
 def render_preview(module_path: str,
                    audio_asset_folders: List[str],
@@ -288,10 +1086,11 @@ def render_preview(module_path: str,
         else:
             audio_seg = AudioSegment.silent(duration=preview_ms)
     ensure_dir(os.path.dirname(out_path) or ".")
-    preview_audio_path = out_path.replace(".mp4", ".mp3")
+    # PCM WAV: the preview audio is only read back by ffmpeg/moviepy, so skip the mp3 encode+decode
+    preview_audio_path = os.path.splitext(out_path)[0] + ".wav"
     export_audio_segment(audio_seg, preview_audio_path)
     # render short video
-    out, used, timeline = render_video_from_module_data(module_data, preview_audio_path, video_asset_folders, image_asset_folders, out_path, fps=24, size=size, row_seconds=DEFAULT_ROW_SECONDS, visual_plugins=visual_plugins, mode=mode)
+    out, used, timeline = render_video_from_module_data(module_data, preview_audio_path, video_asset_folders, image_asset_folders, out_path, fps=24, size=size, row_seconds=DEFAULT_ROW_SECONDS, visual_plugins=visual_plugins, mode=mode, audio_duration=len(audio_seg) / 1000.0, quality="preview")
     # try to open
     try:
         if os.name == "nt":
@@ -4,9 +4,10 @@ YTPMV exporter V5 — writes package and precise timeline mapping.
 The exporter now accepts the timeline returned by the renderer and maps used files
 to copied assets inside the package.
 """
-import os, shutil, json
-from typing import List, Dict, Any
-from .utils import ensure_dir
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+from .utils import ensure_dir, fast_copy, write_json
 
 def export_ytpmv_package(module_data: Dict[str, Any],
                          audio_path: str,
@@ -18,19 +19,30 @@ def export_ytpmv_package(module_data: Dict[str, Any],
     ensure_dir(out_folder)
     dest_audio = os.path.join(out_folder, os.path.basename(audio_path))
     dest_video = os.path.join(out_folder, os.path.basename(video_path))
-    shutil.copy2(audio_path, dest_audio)
-    shutil.copy2(video_path, dest_video)
+    fast_copy(audio_path, dest_audio)
+    fast_copy(video_path, dest_video)
     clips_dir = os.path.join(out_folder, "video_clips")
     ensure_dir(clips_dir)
-    copied = []
-    for vf in (used_video_files or []):
+    def _copy_clip(vf: str) -> Optional[str]:
+        dst = os.path.join(clips_dir, os.path.basename(vf))
+        try:
+            fast_copy(vf, dst)
+        except Exception:
+            return None
+        return os.path.relpath(dst, out_folder)
+
+    # one copy per destination name (the renderer already dedupes paths, other callers may not);
+    # concurrent copies onto the same file would clobber each other
+    by_name: Dict[str, str] = {}
+    for vf in dict.fromkeys(used_video_files or []):
         if os.path.exists(vf):
-            dst = os.path.join(clips_dir, os.path.basename(vf))
-            try:
-                shutil.copy2(vf, dst)
-                copied.append(os.path.relpath(dst, out_folder))
-            except Exception:
-                continue
+            by_name.setdefault(os.path.basename(vf), vf)
+    sources = list(by_name.values())
+    # copies are I/O bound: overlap them, but keep the manifest in used order
+    copied: List[str] = []
+    if sources:
+        with ThreadPoolExecutor(max_workers=min(8, len(sources))) as pool:
+            copied = [rel for rel in pool.map(_copy_clip, sources) if rel]
     manifest: Dict[str, Any] = {
         "module_title": module_data.get("title"),
         "audio": os.path.basename(dest_audio),
@@ -40,13 +52,10 @@ def export_ytpmv_package(module_data: Dict[str, Any],
         "patterns_count": len(module_data.get("patterns", [])),
         "timeline": []
     }
+    copied_by_name = {os.path.basename(c): c for c in copied}
     for entry in (timeline or []):
         used = entry.get("used_files", [])
-        used_mapped = []
-        for u in used:
-            bn = os.path.basename(u)
-            rel = next((c for c in copied if os.path.basename(c) == bn), None)
-            used_mapped.append(rel if rel else u)
+        used_mapped = [copied_by_name.get(os.path.basename(u), u) for u in used]
         manifest["timeline"].append({
             "start": entry.get("start"),
             "duration": entry.get("duration"),
@@ -54,6 +63,7 @@ def export_ytpmv_package(module_data: Dict[str, Any],
             "row_index": entry.get("row_index"),
             "used_files": used_mapped
         })
-    with open(os.path.join(out_folder, manifest_name), "w", encoding="utf-8") as fh:
-        json.dump(manifest, fh, indent=2, ensure_ascii=False)
-    return os.path.join(out_folder, manifest_name)
\ No newline at end of file
+    # orjson when installed (C serializer); written atomically like the queue files
+    manifest_path = os.path.join(out_folder, manifest_name)
+    write_json(manifest_path, manifest)
+    return manifest_path
\ No newline at end of file
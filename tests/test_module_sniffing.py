@@ -0,0 +1,26 @@
+from modpmv.openmpt_adapter import _looks_like_module
+from modpmv.mod_parser import parse
+
+def test_magic_formats_are_modules():
+    assert _looks_like_module(b"IMPM" + b"\0" * 200)
+    assert _looks_like_module(b"Extended Module: song" + b" " * 100)
+    mk = bytearray(b"x" * 1084); mk[1080:1084] = b"M.K."
+    assert _looks_like_module(bytes(mk))
+
+def test_text_and_other_files_are_not_modules():
+    assert not _looks_like_module(b"IMPM")  # too short
+    assert not _looks_like_module(b"TITLE: x\nPATTERN:\nSAMPLE:kick REST\n" * 4)
+    assert not _looks_like_module(b"\x89PNG\r\n\x1a\n" + b"\0" * 200)
+    assert not _looks_like_module(b"\0\0\0\x18ftypisom" + b"\0" * 200)
+
+def test_magicless_binary_still_passes():
+    # e.g. 15-sample MODs have no signature, only NUL padding
+    assert _looks_like_module(b"song" + b"\0" * 600)
+
+def test_text_song_saved_as_mod_uses_text_parser(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # a missing binding is diagnosed into output/
+    p = tmp_path / "song.mod"
+    p.write_text("TITLE: Scratch\nPATTERN:\nREST SAMPLE:kick\nREST REST\nORDER: 0\n", encoding="utf-8")
+    md = parse(str(p))
+    assert md["title"] == "Scratch"
+    assert md["patterns"][0][0][:2] == ["REST", "SAMPLE:kick"]
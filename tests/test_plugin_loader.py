@@ -0,0 +1,44 @@
+import os, time
+from modpmv.plugins import loader
+
+PLUGIN = '''
+from modpmv.plugins.base import VisualPlugin
+RUNS = []
+RUNS.append(1)
+class Probe(VisualPlugin):
+    name = "probe-visual"
+    label = {label!r}
+    def render(self, audio_path, duration, size):
+        return None
+'''
+
+def _write(path, label):
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(PLUGIN.format(label=label))
+
+def test_discovery_is_cached_until_a_file_changes(tmp_path):
+    folder = tmp_path / "plugins"; folder.mkdir()
+    src = str(folder / "probe.py")
+    _write(src, "v1")
+    loader.refresh_plugins()
+    first = loader.discover_plugins(str(folder))["visual"]["probe-visual"]
+    again = loader.discover_plugins(str(folder))["visual"]["probe-visual"]
+    assert again is first  # not re-executed
+    assert first.label == "v1"
+    # callers get fresh dicts: mutating one doesn't touch the cache
+    loader.discover_plugins(str(folder))["visual"].clear()
+    assert "probe-visual" in loader.discover_plugins(str(folder))["visual"]
+    _write(src, "v2-changed")
+    st = os.stat(src)
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    changed = loader.discover_plugins(str(folder))["visual"]["probe-visual"]
+    assert changed is not first and changed.label == "v2-changed"
+
+def test_refresh_keeps_unchanged_modules(tmp_path):
+    folder = tmp_path / "plugins"; folder.mkdir()
+    _write(str(folder / "probe.py"), "v1")
+    loader.refresh_plugins()
+    first = loader.discover_plugins(str(folder))["visual"]["probe-visual"]
+    # refresh rescans, but an unchanged file's module is reused rather than re-executed
+    again = loader.discover_plugins(str(folder), refresh=True)["visual"]["probe-visual"]
+    assert again is first
@@ -0,0 +1,34 @@
+import os, wave, pytest
+
+def _silent_wav(path, seconds):
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1); w.setsampwidth(2); w.setframerate(8000)
+        w.writeframes(b"\0\0" * int(8000 * seconds))
+
+def test_rgba_background_row_matches_across_modes(tmp_path):
+    np = pytest.importorskip("numpy")
+    Image = pytest.importorskip("PIL.Image")
+    pytest.importorskip("moviepy.editor")
+    from modpmv.utils import ffmpeg_exe
+    if not ffmpeg_exe():
+        pytest.skip("ffmpeg not available")
+    from modpmv.video_renderer import render_video_from_module_data
+    from moviepy.editor import VideoFileClip
+    images = tmp_path / "images"; images.mkdir()
+    px = np.zeros((36, 64, 4), dtype=np.uint8); px[..., 1] = 255; px[..., 3] = 128  # 50% green
+    Image.fromarray(px, "RGBA").save(str(images / "half.png"))
+    audio = str(tmp_path / "a.wav"); _silent_wav(audio, 0.5)
+    # REST-only rows: the frame is just the background, flattened over black once
+    module = {"channels": 1, "patterns": [[["REST"], ["REST"]]], "order": [0]}
+    greens = {}
+    for mode in ("moviepy", "ffmpeg", "stream"):
+        out = str(tmp_path / f"{mode}.mp4")
+        render_video_from_module_data(module, audio, [], [str(images)], out, fps=12, size=(64, 36),
+                                      mode=mode, audio_duration=0.5, quality="archive")
+        clip = VideoFileClip(out)
+        try:
+            greens[mode] = int(clip.get_frame(0.2)[18, 32, 1])
+        finally:
+            clip.close()
+    assert max(greens.values()) - min(greens.values()) <= 6, greens
+    assert abs(greens["moviepy"] - 128) <= 6, greens
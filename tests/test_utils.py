@@ -0,0 +1,36 @@
+import os, json, stat
+from modpmv import utils
+
+def _leftovers(folder, name):
+    return [f for f in os.listdir(folder) if f.startswith(name + ".") and f.endswith(".tmp")]
+
+def test_atomic_write_bytes_replaces_and_cleans_up(tmp_path):
+    p = str(tmp_path / "job.json")
+    utils.atomic_write_bytes(p, b"one")
+    utils.atomic_write_bytes(p, b"two")
+    with open(p, "rb") as fh:
+        assert fh.read() == b"two"
+    assert _leftovers(str(tmp_path), "job.json") == []
+
+def test_atomic_write_bytes_modes(tmp_path):
+    p = str(tmp_path / "new.json")
+    old = os.umask(0o077)
+    try:
+        utils.atomic_write_bytes(p, b"x")
+    finally:
+        os.umask(old)
+    # new files get what open() would give them under the umask read at import
+    assert stat.S_IMODE(os.stat(p).st_mode) == 0o666 & ~utils._UMASK
+    os.chmod(p, 0o640)
+    utils.atomic_write_bytes(p, b"y")
+    assert stat.S_IMODE(os.stat(p).st_mode) == 0o640  # existing mode is kept
+
+def test_write_json_round_trip(tmp_path):
+    p = str(tmp_path / "m.json")
+    data = {"title": "Café ✓", "order": [0, 1], "timeline": [{"start": 0.25, "used_files": []}]}
+    utils.write_json(p, data)
+    assert utils.read_json(p) == data
+    with open(p, encoding="utf-8") as fh:
+        text = fh.read()
+    assert "Café ✓" in text  # UTF-8, not \u escapes
+    assert json.loads(text) == data
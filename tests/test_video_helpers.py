@@ -0,0 +1,42 @@
+import subprocess, pytest
+np = pytest.importorskip("numpy")
+from modpmv import video_renderer as vr
+from modpmv.utils import ffmpeg_exe
+
+def _numpy_i420(frame):
+    h, w = frame.shape[:2]
+    cv2, vr.cv2 = vr.cv2, None  # the numpy fallback, even where OpenCV is installed
+    try:
+        return vr._rgb_to_i420(frame, np.empty((h * 3 // 2, w), dtype=np.uint8)).reshape(-1)
+    finally:
+        vr.cv2 = cv2
+
+def test_rgb_to_i420_bt601_levels():
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+    frame[:2] = 255  # top half white, bottom half black
+    out = _numpy_i420(frame).astype(int)
+    assert list(out[:16]) == [235] * 8 + [16] * 8
+    assert np.abs(out[16:] - 128).max() <= 1
+
+def test_rgb_to_i420_matches_ffmpeg():
+    ff = ffmpeg_exe()
+    if not ff:
+        pytest.skip("ffmpeg not available")
+    h, w = 32, 48
+    frame = np.random.default_rng(0).integers(0, 256, (h, w, 3), dtype=np.uint8)
+    ref = subprocess.run([ff, "-v", "error", "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{w}x{h}", "-i", "-",
+                          "-f", "rawvideo", "-pix_fmt", "yuv420p", "-"],
+                         input=frame.tobytes(), capture_output=True).stdout
+    ref = np.frombuffer(ref, dtype=np.uint8).astype(int)
+    diff = _numpy_i420(frame).astype(int) - ref
+    luma, chroma = diff[:h * w], diff[h * w:]
+    # rounded, not truncated: no systematic bias against swscale
+    assert np.abs(luma).max() <= 1
+    assert abs(luma.mean()) < 0.15
+    assert abs(chroma.mean()) < 0.15
+
+def test_ffconcat_quote_escapes_single_quotes():
+    assert vr._ffconcat_quote("/clips/kick.mp4") == "'/clips/kick.mp4'"
+    # a quote closes the string, is escaped, and reopens it
+    assert vr._ffconcat_quote("/clips/it's.mp4") == "'/clips/it'\\''s.mp4'"
+    assert vr._ffconcat_quote("/a b/#1.mp4") == "'/a b/#1.mp4'"